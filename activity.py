@@ -0,0 +1,281 @@
+import math
+from array import array
+from collections import deque
+
+# Activity kinds stored in the 'kind' column
+MOUSE_MOVE = 0
+KEY_PRESS = 1
+CLICK = 2
+SCROLL = 3
+
+ACTIVITY_NAMES = ('mouse_move', 'key_press', 'click', 'scroll')
+ACTIVITY_KINDS = {name: kind for kind, name in enumerate(ACTIVITY_NAMES)}
+
+# Column name -> array typecode
+COLUMNS = {
+    'time': 'd',
+    'x': 'i',
+    'y': 'i',
+    'distance': 'd',
+    'kind': 'b',
+    'delta': 'i',
+    'span': 'd',    # Seconds covered by a coalesced event (0 for a single sample)
+}
+
+
+class EventRing:
+    """Fixed-capacity event history stored in preallocated typed columns
+
+    Appending overwrites the oldest slot in place, so recording an event
+    never allocates. Readers get the newest N values of a column as one or
+    two memoryview slices (two when the window wraps around the end).
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.head = 0   # Next slot to write
+        self.count = 0
+        self.columns = {}
+        self.views = {}
+        for name, typecode in COLUMNS.items():
+            column = array(typecode, bytes(array(typecode).itemsize * capacity))
+            self.columns[name] = column
+            self.views[name] = memoryview(column)
+        # Direct references for the append path
+        self.time = self.columns['time']
+        self.x = self.columns['x']
+        self.y = self.columns['y']
+        self.distance = self.columns['distance']
+        self.kind = self.columns['kind']
+        self.delta = self.columns['delta']
+        self.span = self.columns['span']
+
+    def __len__(self):
+        return self.count
+
+    def append(self, timestamp, kind=0, x=0, y=0, distance=0.0, delta=0, span=0.0):
+        """Write one event over the oldest slot"""
+        i = self.head
+        self.time[i] = timestamp
+        self.kind[i] = kind
+        self.x[i] = x
+        self.y[i] = y
+        self.distance[i] = distance
+        self.delta[i] = delta
+        self.span[i] = span
+        i += 1
+        self.head = 0 if i == self.capacity else i
+        if self.count < self.capacity:
+            self.count += 1
+
+    def clear(self):
+        """Forget all events (column contents are simply overwritten later)"""
+        self.head = 0
+        self.count = 0
+
+    def slot(self, index):
+        """Physical slot of a logical index (0 = oldest, -1 = newest)"""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("event index out of range")
+        return (self.head - self.count + index) % self.capacity
+
+    def get(self, column, index):
+        """Single value of a column at a logical index"""
+        return self.columns[column][self.slot(index)]
+
+    def newest(self, column, back=0):
+        """Value of a column 'back' events before the newest one"""
+        return self.columns[column][(self.head - 1 - back) % self.capacity]
+
+    def window(self, column, n):
+        """Newest n values of a column as a tuple of memoryview slices, oldest first"""
+        n = min(n, self.count)
+        view = self.views[column]
+        start = (self.head - n) % self.capacity
+        end = start + n
+        if end <= self.capacity:
+            return (view[start:end],)
+        return (view[start:], view[:end - self.capacity])
+
+
+class MotionCoalescer:
+    """Accumulates raw pointer samples into one aggregate per flush interval
+
+    An aggregate holds the path length (sum of sample-to-sample steps,
+    including the step from the previous aggregate's last position), the
+    net displacement, the bounding box, the sample count and the time from
+    its first to its last sample. Rates computed over consecutive
+    aggregates therefore use exactly the same path and span as the raw
+    samples they contain; the only difference from an un-decimated window
+    is that windows start and end on aggregate boundaries, so the covered
+    span can be off by at most one flush interval.
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.x = 0   # Last raw position
+        self.y = 0
+        self.clear()
+
+    def clear(self):
+        """Drop the pending aggregate (the last position is kept)"""
+        self.samples = 0
+        self.path = 0.0
+        self.start_time = 0.0
+        self.end_time = 0.0
+        self.start_x = self.min_x = self.max_x = self.x
+        self.start_y = self.min_y = self.max_y = self.y
+
+    def add(self, timestamp, x, y):
+        """Add a raw sample; returns True once the interval is full and should be flushed"""
+        self.path += math.hypot(x - self.x, y - self.y)
+        if self.samples:
+            if x < self.min_x:
+                self.min_x = x
+            elif x > self.max_x:
+                self.max_x = x
+            if y < self.min_y:
+                self.min_y = y
+            elif y > self.max_y:
+                self.max_y = y
+        else:
+            self.start_time = timestamp
+            self.start_x = self.x
+            self.start_y = self.y
+            self.min_x = self.max_x = x
+            self.min_y = self.max_y = y
+        self.samples += 1
+        self.end_time = timestamp
+        self.x = x
+        self.y = y
+        return timestamp - self.start_time >= self.interval
+
+    def displacement(self):
+        """Straight-line distance covered by the pending aggregate"""
+        return math.hypot(self.x - self.start_x, self.y - self.start_y)
+
+    def bounding_box(self):
+        return (self.min_x, self.min_y, self.max_x, self.max_y)
+
+
+class SlidingSum:
+    """Running sum of the newest `size` values pushed"""
+
+    RESYNC_INTERVAL = 4096  # Pushes between exact recomputations (bounds float drift)
+
+    def __init__(self, size):
+        self.size = size
+        self.values = array('d', bytes(8 * size))
+        self.head = 0
+        self.count = 0
+        self.total = 0.0
+        self.pushes = 0
+
+    def push(self, value):
+        i = self.head
+        if self.count == self.size:
+            self.total -= self.values[i]
+        else:
+            self.count += 1
+        self.values[i] = value
+        self.total += value
+        i += 1
+        self.head = 0 if i == self.size else i
+        self.pushes += 1
+        if self.pushes == self.RESYNC_INTERVAL:
+            self.pushes = 0
+            self.total = sum(self.values[:self.count]) if self.count < self.size else sum(self.values)
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+        self.total = 0.0
+        self.pushes = 0
+
+
+class RunLengthWindow:
+    """Longest completed run of identical kinds among the newest `size` activities
+
+    Matches scanning the window left to right and only counting a run once
+    a different kind ends it; the run still in progress is not counted and
+    a run that started before the window is clipped to the window start.
+    Each push is amortized O(1) and reading the result is O(1).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        self.position = 0       # Activities seen so far
+        self.previous = None
+        self.run_start = 0
+        self.runs = deque()     # Completed runs (start, end) still touching the window
+        self.maxima = deque()   # Completed runs inside the window, lengths decreasing
+
+    def push(self, kind):
+        position = self.position
+        if kind != self.previous:
+            if self.previous is not None:
+                start = self.run_start
+                length = position - start
+                self.runs.append((start, position - 1))
+                maxima = self.maxima
+                while maxima and maxima[-1][1] <= length:
+                    maxima.pop()
+                maxima.append((start, length))
+            self.run_start = position
+            self.previous = kind
+        self.position = position + 1
+
+        window_start = self.position - self.size
+        runs = self.runs
+        while runs and runs[0][1] < window_start:
+            runs.popleft()
+        maxima = self.maxima
+        while maxima and maxima[0][0] < window_start:
+            maxima.popleft()
+
+    def longest(self):
+        window_start = max(0, self.position - self.size)
+        best = self.maxima[0][1] if self.maxima else 0
+        if self.runs and self.runs[0][0] < window_start:
+            # Run straddling the window start only counts its visible part
+            best = max(best, self.runs[0][1] - window_start + 1)
+        return best
+
+
+class RecentKeyCounter:
+    """Key presses still in the activity buffer that happened after a given time
+
+    Cutoff times must not decrease between calls (they follow the oldest
+    mouse movement in the window), so expired presses are dropped for good.
+    """
+
+    def __init__(self, buffer_size):
+        self.buffer_size = buffer_size
+        self.times = deque()
+        self.positions = deque()
+
+    def push(self, timestamp, position):
+        self.times.append(timestamp)
+        self.positions.append(position)
+        if self.positions[0] <= position - self.buffer_size:
+            self.times.popleft()
+            self.positions.popleft()
+
+    def count_after(self, cutoff, position):
+        """Presses newer than cutoff among the last buffer_size activities before position"""
+        oldest_position = position - self.buffer_size
+        times = self.times
+        positions = self.positions
+        while times and (times[0] <= cutoff or positions[0] < oldest_position):
+            times.popleft()
+            positions.popleft()
+        return len(times)
+
+    def clear(self):
+        self.times.clear()
+        self.positions.clear()
@@ -0,0 +1,68 @@
+"""Compact binary traces of raw input events
+
+A trace is a 8-byte header (magic + format version) followed by fixed-size
+little-endian records: timestamp (float64), kind (int8), x, y and delta
+(int32). Records are packed into a preallocated buffer and written out in
+large chunks, so recording costs one pack_into per event.
+"""
+import struct
+
+MAGIC = b'ZCTR'
+VERSION = 1
+HEADER = struct.Struct('<4sHxx')
+RECORD = struct.Struct('<dbiii')
+
+
+class TraceRecorder:
+    """Streams (kind, timestamp, x, y, delta) events to a trace file"""
+
+    def __init__(self, path, buffer_events=4096):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.buffer = bytearray(RECORD.size * buffer_events)
+        self.offset = 0
+        self.events = 0
+
+    def record(self, kind, timestamp, x=0, y=0, delta=0):
+        RECORD.pack_into(self.buffer, self.offset, timestamp, kind, x, y, delta)
+        self.offset += RECORD.size
+        self.events += 1
+        if self.offset == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        if self.offset:
+            self.file.write(memoryview(self.buffer)[:self.offset])
+            self.offset = 0
+        self.file.flush()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+
+def read_trace(path, chunk_events=4096):
+    """Yield (kind, timestamp, x, y, delta) tuples from a trace file"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path}: not a ZombieCheck trace")
+        magic, version = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a ZombieCheck trace")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported trace version {version}")
+
+        chunk_size = RECORD.size * chunk_events
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            usable = len(chunk) - len(chunk) % RECORD.size  # Ignore a torn final record
+            for timestamp, kind, x, y, delta in RECORD.iter_unpack(chunk[:usable]):
+                yield (kind, timestamp, x, y, delta)
+            if usable < len(chunk):
+                break
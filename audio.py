@@ -0,0 +1,243 @@
+"""Challenge alarm playback on a single long-lived worker thread
+
+The GUI only posts commands (start_alarm, stop, close) to the worker's
+queue, so it never waits on audio. Tones are rendered to 16-bit mono PCM
+once at startup and handed to a backend:
+
+    WinsoundBackend  Windows, PlaySound from an in-memory WAV
+    PipeBackend      one PCM player process per alarm, such as aplay/pacat (Linux)
+    FileBackend      appends everything played to a WAV file
+    BellBackend      terminal bell, when nothing better is available
+    NullBackend      counts plays; for tests and headless runs
+"""
+import io
+import math
+import platform
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import wave
+from array import array
+
+SAMPLE_RATE = 22050
+ALARM_FREQUENCY = 1000     # Hz
+ALARM_TONE = 0.4           # Seconds of tone per beep
+ALARM_GAP = 0.8            # Seconds of silence between beeps
+
+
+def render_tone(frequency, duration, sample_rate=SAMPLE_RATE, volume=0.5, fade=0.005):
+    """16-bit little-endian mono PCM for a sine tone with short fades (no clicks)"""
+    count = int(duration * sample_rate)
+    fade_samples = max(1, int(fade * sample_rate))
+    amplitude = volume * 32767
+    step = 2 * math.pi * frequency / sample_rate
+    samples = array('h', bytes(2 * count))
+    for i in range(count):
+        envelope = min(1.0, i / fade_samples, (count - 1 - i) / fade_samples)
+        samples[i] = int(amplitude * envelope * math.sin(step * i))
+    if sys.byteorder != 'little':
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def wav_bytes(pcm, sample_rate=SAMPLE_RATE):
+    """Wrap PCM from render_tone in a WAV container"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class NullBackend:
+    """Plays nothing; counts what it was asked to play"""
+
+    def __init__(self):
+        self.plays = 0
+
+    def play(self, pcm):
+        self.plays += 1
+
+    def interrupt(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class BellBackend(NullBackend):
+    """Terminal bell; the tone itself is ignored"""
+
+    def play(self, pcm):
+        super().play(pcm)
+        print('\a', end='', flush=True)
+
+
+class WinsoundBackend:
+    """Windows PlaySound from an in-memory WAV"""
+
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        import winsound
+        self.winsound = winsound
+        self.sample_rate = sample_rate
+        self.wavs = {}
+
+    def play(self, pcm):
+        wav = self.wavs.get(pcm)
+        if wav is None:
+            wav = self.wavs[pcm] = wav_bytes(pcm, self.sample_rate)
+        self.winsound.PlaySound(wav, self.winsound.SND_MEMORY)
+
+    def interrupt(self):
+        self.winsound.PlaySound(None, 0)  # Stops the sound playing on the worker
+
+    def close(self):
+        self.interrupt()
+
+
+class PipeBackend:
+    """Streams the alarm into one PCM player process kept open until interrupted
+
+    Each play() writes the tone followed by `gap` seconds of silence, so the
+    player's own clock spaces the beeps and the pipe's backpressure keeps
+    the worker from running ahead of it. interrupt() ends the process (and
+    with it whatever audio is still buffered); the next play() starts one.
+    """
+
+    def __init__(self, command, gap=ALARM_GAP, sample_rate=SAMPLE_RATE):
+        self.command = command
+        self.silence = bytes(2 * int(gap * sample_rate))
+        self.process = None
+        self.lock = threading.Lock()
+
+    def play(self, pcm):
+        with self.lock:
+            process = self.process
+            if process is None:
+                process = self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE,
+                                                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            process.stdin.write(pcm)
+            process.stdin.write(self.silence)
+            process.stdin.flush()
+        except (OSError, ValueError):
+            # Interrupted, or the player exited on its own
+            with self.lock:
+                if self.process is not process:
+                    return
+                self.process = None
+            self._end(process)
+
+    def interrupt(self):
+        with self.lock:
+            process, self.process = self.process, None
+        if process is not None:
+            self._end(process)
+
+    def close(self):
+        self.interrupt()
+
+    @staticmethod
+    def _end(process):
+        if process.poll() is None:
+            process.terminate()
+        process.wait()
+        try:
+            process.stdin.close()  # The reader is gone, so any buffered frames fail to flush
+        except OSError:
+            pass
+
+
+class FileBackend:
+    """Appends every tone played to a WAV file"""
+
+    def __init__(self, path, sample_rate=SAMPLE_RATE):
+        self.file = wave.open(path, 'wb')
+        self.file.setnchannels(1)
+        self.file.setsampwidth(2)
+        self.file.setframerate(sample_rate)
+        self.plays = 0
+
+    def play(self, pcm):
+        self.file.writeframes(pcm)
+        self.plays += 1
+
+    def interrupt(self):
+        pass
+
+    def close(self):
+        self.file.close()
+
+
+def default_backend():
+    """Best available backend for this platform"""
+    if platform.system() == "Windows":
+        try:
+            return WinsoundBackend()
+        except ImportError:
+            pass
+    for command in (['aplay', '-q', '-t', 'raw', '-f', 'S16_LE', '-c', '1', '-r', str(SAMPLE_RATE)],
+                    ['pacat', '--playback', '--raw', '--format=s16le', '--channels=1', f'--rate={SAMPLE_RATE}']):
+        if shutil.which(command[0]):
+            return PipeBackend(command)
+    if sys.stdout is not None and sys.stdout.isatty():
+        return BellBackend()
+    return NullBackend()
+
+
+_START, _STOP, _CLOSE = range(3)
+
+
+class AudioWorker:
+    """One thread that owns the audio backend; all public methods return immediately"""
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else default_backend()
+        self.alarm_tone = render_tone(ALARM_FREQUENCY, ALARM_TONE)
+        self.commands = queue.SimpleQueue()
+        self.alarming = False
+        self.thread = threading.Thread(target=self._run, name='audio-worker', daemon=True)
+        self.thread.start()
+
+    def start_alarm(self):
+        """Beep repeatedly until stop(); a no-op if already beeping"""
+        self.commands.put(_START)
+
+    def stop(self):
+        self.commands.put(_STOP)
+        self.backend.interrupt()  # Cut the current tone short
+
+    def close(self):
+        self.commands.put(_CLOSE)
+        self.backend.interrupt()
+
+    def _run(self):
+        while True:
+            try:
+                command = self.commands.get(timeout=ALARM_GAP if self.alarming else None)
+            except queue.Empty:
+                command = None  # Gap elapsed: next beep
+
+            if command == _CLOSE:
+                break
+            if command == _STOP:
+                self.alarming = False
+                continue
+            if command == _START:
+                if self.alarming:
+                    continue
+                self.alarming = True
+
+            try:
+                self.backend.play(self.alarm_tone)
+            except Exception as e:
+                print(f"Could not play sound: {e}")
+                self.alarming = False
+        try:
+            self.backend.close()
+        except Exception as e:
+            print(f"Error closing audio backend: {e}")
@@ -0,0 +1,323 @@
+"""Benchmarks for the detection hot paths
+
+    python benchmarks/bench_detection.py                  # run and compare with baseline.json
+    python benchmarks/bench_detection.py --save-baseline  # record new baselines
+    python benchmarks/bench_detection.py --filter check_  # subset
+
+Each case is timed in small batches of calls; latency percentiles are
+per-call times derived from those batches (timing single sub-microsecond
+calls would mostly measure the timer). Allocation figures come from
+tracemalloc over a separate run: bytes still held per call (should be ~0)
+and the peak transient bytes of one batch.
+
+Each case is measured --repeat times (default 5) and the run with the
+lowest p50 is kept: scheduler and frequency noise only ever make a run
+slower, so the minimum is the stable figure to compare.
+
+Baselines are machine specific; record them all in one --save-baseline
+run on an otherwise idle machine. A case fails the check when its p50 is
+more than --tolerance (default 50%) slower than the stored baseline.
+Cases without a baseline are listed, and fail the check with --strict.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from activity import MOUSE_MOVE, KEY_PRESS, CLICK, SCROLL
+from clock import VirtualClock
+from decisions import DecisionTrace
+from detector import ZombieDetector
+from input_sources import TkInputSource
+from metrics import AppMetrics
+from persistence import StatsJournal
+from simulate import DEFAULT_SETTINGS, DEFAULT_STATS
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+RATES = (100, 1000, 10000)     # Synthetic input events per second
+FILLS = ('empty', 'full')      # History buffers before the measured calls
+BATCH = 50                     # Calls per timed batch
+BATCH_EVENTS = 20              # Events per input-source batch (20 ms at 1000/s)
+BATCHES = 400
+
+
+def make_detector(rate, fill, seed=0):
+    """Detector whose buffers are empty or warmed with mixed activity at the given rate"""
+    detector = ZombieDetector(dict(DEFAULT_SETTINGS), dict(DEFAULT_STATS))
+    if fill == 'full':
+        rng = random.Random(seed)
+        step = 1.0 / rate
+        t = 0.0
+        events = []
+        for i in range(2000):
+            t += step
+            kind = rng.choice((MOUSE_MOVE, MOUSE_MOVE, MOUSE_MOVE, KEY_PRESS, CLICK, SCROLL))
+            events.append((kind, t, rng.randint(0, 1920), rng.randint(0, 1080), 1))
+        detector.feed(events)
+        detector.flush_motion()
+        detector.last_activity = t
+    return detector
+
+
+def motion_events(rate, count, start=100.0):
+    step = 1.0 / rate
+    return [(start + i * step, 400 + (i * 7) % 300, 300 + (i * 3) % 200) for i in range(count)]
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(setup, call, batch=BATCH, batches=BATCHES):
+    """Time call(state, i) in batches; returns latency percentiles (ns/call) and allocation figures"""
+    state = setup()
+    samples = []
+    i = 0
+    perf_counter_ns = time.perf_counter_ns
+    for _ in range(batches):
+        started = perf_counter_ns()
+        for _ in range(batch):
+            call(state, i)
+            i += 1
+        samples.append((perf_counter_ns() - started) / batch)
+    samples.sort()
+
+    state = setup()
+    tracemalloc.start()
+    try:
+        call(state, 0)  # Warm up lazily created objects
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for j in range(1, batch + 1):
+            call(state, j)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'p50_ns': round(percentile(samples, 0.50), 1),
+        'p90_ns': round(percentile(samples, 0.90), 1),
+        'p99_ns': round(percentile(samples, 0.99), 1),
+        'max_ns': round(samples[-1], 1),
+        'retained_bytes_per_call': round((after - before) / batch, 1),
+        'peak_batch_bytes': peak - before,
+    }
+
+
+def detector_cases():
+    """(name, setup, call) for the headless detection paths"""
+    cases = []
+    for rate in RATES:
+        for fill in FILLS:
+            suffix = f"[{rate}/s,{fill}]"
+
+            def motion_setup(rate=rate, fill=fill):
+                return make_detector(rate, fill), motion_events(rate, BATCH * BATCHES + BATCH + 1)
+
+            def motion_call(state, i):
+                detector, events = state
+                t, x, y = events[i]
+                detector.on_motion(t, x, y)
+
+            cases.append((f"on_mouse_move{suffix}", motion_setup, motion_call))
+
+            def record_setup(rate=rate, fill=fill):
+                return make_detector(rate, fill), 100.0, 1.0 / rate
+
+            def record_call(state, i):
+                detector, start, step = state
+                detector.record_activity(i & 3, start + i * step)
+
+            cases.append((f"record_activity{suffix}", record_setup, record_call))
+
+        for check in ('check_repetitive_actions', 'check_aimless_movement',
+                      'check_rapid_switching', 'check_scroll_zombie'):
+            def check_setup(rate=rate):
+                return make_detector(rate, 'full')
+
+            def check_call(detector, i, check=check):
+                getattr(detector, check)()
+
+            cases.append((f"{check}[{rate}/s]", check_setup, check_call))
+
+        def evaluate_setup(rate=rate):
+            detector = make_detector(rate, 'full')
+            return detector, detector.last_activity
+
+        def evaluate_call(state, i):
+            detector, now = state
+            detector.tolerance_level = 50
+            detector.evaluate(now)
+
+        cases.append((f"evaluate[{rate}/s]", evaluate_setup, evaluate_call))
+
+    def traced_setup():
+        detector = make_detector(1000, 'full')
+        detector.trace = DecisionTrace()
+        return detector, detector.last_activity
+
+    cases.append(("evaluate[1000/s,traced]", traced_setup, evaluate_call))
+    return cases
+
+
+def gui_cases():
+    """Cases that need the app module (and, for the tolerance bar, a display)"""
+    try:
+        import app
+    except Exception as e:
+        print(f"Skipping GUI benchmarks: cannot import app ({e})")
+        return []
+
+    cases = []
+
+    def adapter_setup():
+        detector = make_detector(1000, 'full')
+        clock = VirtualClock(100.0)
+        gui = SimpleNamespace(detector=detector, clock=clock, recorder=None, challenge_window=None,
+                              metrics=AppMetrics())
+        gui.wake_analysis = lambda now: None
+        source = TkInputSource(None, clock)
+        source.sink = lambda events: app.ZombieCheck.on_input(gui, events)
+        return source, SimpleNamespace(x_root=0, y_root=0)
+
+    def adapter_call(state, i):
+        source, event = state
+        source.clock.advance(0.001)
+        event.x_root = i % 500
+        event.y_root = i % 300
+        source.on_motion(event)
+
+    cases.append(("gui.on_mouse_move", adapter_setup, adapter_call))
+
+    def batch_setup():
+        detector = make_detector(1000, 'full')
+        gui = SimpleNamespace(detector=detector, clock=VirtualClock(100.0), recorder=None, challenge_window=None,
+                              metrics=AppMetrics())
+        gui.wake_analysis = lambda now: None
+        return gui, [(MOUSE_MOVE, 100.0 + i * 0.001, i % 500, i % 300, 0) for i in range(BATCH_EVENTS)]
+
+    def batch_call(state, i):
+        gui, events = state
+        app.ZombieCheck.on_input(gui, events)
+
+    cases.append((f"gui.on_input[{BATCH_EVENTS} events]", batch_setup, batch_call))
+
+    workdir = tempfile.mkdtemp(prefix='zombie-bench-')
+
+    def save_setup():
+        detector = make_detector(1000, 'full')
+        # Each setup gets its own files: earlier journals' writer threads may still be compacting
+        journal = StatsJournal(os.path.join(tempfile.mkdtemp(dir=workdir), 'zombie_stats.json'))
+        journal.recover()
+        return SimpleNamespace(stats=detector.stats, settings=detector.settings, detector=detector,
+                               journal=journal, metrics=AppMetrics())
+
+    def save_call(gui, i):
+        gui.stats['current_streak'] = i
+        app.ZombieCheck.save_stats(gui)
+
+    cases.append(("save_stats", save_setup, save_call))
+
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception as e:
+        print(f"Skipping update_tolerance_bar: no display ({e})")
+        return cases
+
+    def bar_setup():
+        detector = make_detector(1000, 'full')
+        canvas = tk.Canvas(root, width=300, height=10)
+        gui = SimpleNamespace(detector=detector, clock=VirtualClock(100.0), tolerance_canvas=canvas,
+                              root=root, is_active=False)
+        gui.is_in_grace_period = lambda: False
+        gui.request_render = lambda: None
+        app.ZombieCheck.create_tolerance_bar(gui)
+        return gui
+
+    def bar_call(gui, i):
+        gui.detector.tolerance_level = i % 100
+        app.ZombieCheck.update_tolerance_bar(gui)
+
+    cases.append(("update_tolerance_bar", bar_setup, bar_call))
+
+    def bar_unchanged_call(gui, i):
+        gui.detector.tolerance_level = 50
+        app.ZombieCheck.update_tolerance_bar(gui)
+
+    cases.append(("update_tolerance_bar[unchanged]", bar_setup, bar_unchanged_call))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ZombieCheck detection hot paths")
+    parser.add_argument('--filter', default='', help="only run cases whose name contains this")
+    parser.add_argument('--save-baseline', action='store_true', help="store results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.5, help="allowed p50 slowdown vs baseline")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per case; the fastest p50 is kept")
+    parser.add_argument('--strict', action='store_true', help="fail on cases that have no baseline")
+    parser.add_argument('--json', metavar='PATH', help="also write results to this file")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    missing = []
+    print(f"{'case':44s} {'p50':>9s} {'p90':>9s} {'p99':>9s} {'max':>9s} {'held B':>7s} {'peak B':>7s}  vs base")
+    for name, setup, call in detector_cases() + gui_cases():
+        if args.filter not in name:
+            continue
+        result = min((measure(setup, call) for _ in range(args.repeat)), key=lambda run: run['p50_ns'])
+        results[name] = result
+
+        if name in baseline:
+            ratio = result['p50_ns'] / baseline[name]['p50_ns']
+            comparison = f"{ratio:5.2f}x"
+            if ratio > 1 + args.tolerance:
+                regressions.append((name, ratio))
+                comparison += "  SLOWER"
+        else:
+            missing.append(name)
+            comparison = "NO BASELINE"
+        print(f"{name:44s} {result['p50_ns']:8.0f}n {result['p90_ns']:8.0f}n {result['p99_ns']:8.0f}n "
+              f"{result['max_ns']:8.0f}n {result['retained_bytes_per_call']:7.1f} {result['peak_batch_bytes']:7d}  {comparison}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+        return 0
+
+    if missing:
+        print(f"\n{len(missing)} case(s) have no baseline (record with --save-baseline):")
+        for name in missing:
+            print(f"  {name}")
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.tolerance:.0%}:")
+        for name, ratio in regressions:
+            print(f"  {name}: {ratio:.2f}x baseline p50")
+    return 1 if regressions or (missing and args.strict) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+import time
+
+
+class MonotonicClock:
+    """Production clock; immune to wall-clock jumps (NTP corrections, suspend)"""
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """Simulation clock that only moves when told to"""
+
+    def __init__(self, start=0.0):
+        self.current = start
+
+    def now(self):
+        return self.current
+
+    def advance(self, seconds):
+        self.current += seconds
+
+    def advance_to(self, timestamp):
+        if timestamp > self.current:
+            self.current = timestamp
+
+    def sleep(self, seconds):
+        self.advance(seconds)
@@ -0,0 +1,143 @@
+"""asyncio event loop run inside the Tk mainloop
+
+TkAsyncBridge drives a selector-based asyncio loop from the Tk thread, so
+coroutines can touch widgets directly and share state with Tk callbacks
+without locks. Nothing polls: the selector's own descriptor (epoll/kqueue)
+is registered with createfilehandler, so I/O readiness (add_reader) and
+call_soon_threadsafe() from worker threads wake Tk, and timers are served
+by a single after() armed for the loop's earliest scheduled callback.
+Each pump runs one non-blocking loop iteration (call_soon(stop) followed
+by run_forever()). TkEventLoop notes what its call_soon() and call_at()
+queue, which is how the bridge learns when the loop next has work.
+
+Where the selector has no pollable descriptor (select() on Windows) the
+bridge also pumps every POLL_INTERVAL_MS.
+"""
+import asyncio
+import heapq
+import selectors
+import time
+import tkinter as tk
+
+POLL_INTERVAL_MS = 20
+
+
+class TkEventLoop(asyncio.SelectorEventLoop):
+    """Selector loop that tracks its pending callbacks and timers"""
+
+    def __init__(self, selector=None):
+        super().__init__(selector)
+        self.callbacks_added = False    # Set by call_soon(); the bridge clears it per pump
+        self.timers = []                # Heap of TimerHandles, pruned lazily
+
+    def call_soon(self, callback, *args, context=None):
+        self.callbacks_added = True
+        return super().call_soon(callback, *args, context=context)
+
+    def call_at(self, when, callback, *args, context=None):
+        handle = super().call_at(when, callback, *args, context=context)
+        heapq.heappush(self.timers, handle)
+        return handle
+
+    def next_deadline(self):
+        """Loop time of the earliest live timer, or None
+
+        Cancelled timers are dropped. Timers already due are dropped too,
+        after being reported: the next iteration is bound to run them.
+        """
+        timers = self.timers
+        now = self.time()
+        deadline = None
+        while timers and (timers[0].cancelled() or timers[0].when() <= now):
+            handle = heapq.heappop(timers)
+            if not handle.cancelled():
+                deadline = now
+        if deadline is None and timers:
+            deadline = timers[0].when()
+        return deadline
+
+
+class TkAsyncBridge:
+    """An asyncio loop whose iterations are scheduled by Tk"""
+
+    def __init__(self, root):
+        self.root = root
+        self.selector = selectors.DefaultSelector()
+        self.loop = TkEventLoop(self.selector)
+        asyncio.set_event_loop(self.loop)
+        self.tasks = set()
+        self.job = None
+        self.job_due = None
+        self.pumping = False
+        try:
+            self.fd = self.selector.fileno()
+        except AttributeError:
+            self.fd = None
+        if self.fd is not None:
+            self.root.tk.createfilehandler(self.fd, tk.READABLE, lambda fd, mask: self.pump())
+
+    def spawn(self, coro, name=None):
+        """Run a coroutine as a task on the loop; close() cancels whatever is left"""
+        task = self.loop.create_task(coro, name=name)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        self.poke()
+        return task
+
+    def cancel(self, task):
+        if task is not None and not task.done():
+            task.cancel()
+            self.poke()
+
+    def poke(self):
+        """Pump soon; call after Tk code made loop callbacks ready (Event.set, cancel, ...)"""
+        self.arm(0)
+
+    def arm(self, delay_ms):
+        """Make sure a pump runs within delay_ms"""
+        due = time.monotonic() + delay_ms / 1000
+        if self.job is not None:
+            if self.job_due <= due:
+                return
+            self.root.after_cancel(self.job)
+        self.job = self.root.after(delay_ms, self.pump)
+        self.job_due = due
+
+    def pump(self):
+        """Run one loop iteration without blocking, then arm Tk for the next one"""
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        if self.pumping or self.loop.is_closed():
+            return  # Re-entered from a Tk callback run inside a task; the outer pump re-arms
+        self.pumping = True
+        try:
+            self.loop.call_soon(self.loop.stop)
+            self.loop.callbacks_added = False   # Everything queued so far runs in this iteration
+            self.loop.run_forever()
+        finally:
+            self.pumping = False
+        self.rearm()
+
+    def rearm(self):
+        loop = self.loop
+        deadline = loop.next_deadline()
+        if loop.callbacks_added:
+            self.arm(0)     # Queued during the iteration, so not run by it
+        elif deadline is not None:
+            self.arm(max(0, int((deadline - loop.time()) * 1000) + 1))
+        if self.fd is None:
+            self.arm(POLL_INTERVAL_MS)
+
+    def close(self):
+        """Cancel remaining tasks, let them unwind and close the loop"""
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        if self.fd is not None:
+            self.root.tk.deletefilehandler(self.fd)
+        for task in list(self.tasks):
+            task.cancel()
+        if self.tasks:
+            self.loop.run_until_complete(asyncio.gather(*self.tasks, return_exceptions=True))
+        self.loop.close()
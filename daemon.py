@@ -0,0 +1,334 @@
+"""Capture and detection in a separate process
+
+With --daemon the input source, idle provider and ZombieDetector run in a
+child process that is never blocked by Tk: its loop waits on input
+batches, GUI commands and the detector's next deadline, exactly like the
+in-process scheduler. Everything it produces (activity batches, tick
+verdicts and state after GUI commands) is written to a SharedRing in
+multiprocessing.shared_memory; the GUI only reads the ring.
+
+    GUI  --- commands (Pipe) -->  daemon   reset/begin_challenge/... replayed,
+                                           settings and monitoring on/off
+    GUI  <-- wake byte (Pipe) --  daemon   after verdicts and state changes, and
+                                           before activity records would be lapped
+    GUI  <---- SharedRing ------  daemon   fixed-size records, read lock-free
+
+The GUI keeps a local ZombieDetector behind a DetectorProxy: challenge
+bookkeeping runs there as before, and every call or assignment that
+changes detector state is forwarded, so the daemon stays authoritative
+for tolerance while the GUI owns the challenge dialog. The GUI records
+the metrics for input and ticks it does not see from the ring: per-kind
+event counts from ACTIVITY records and tick durations from VERDICT
+records. System-wide input (evdev/x11) is required; Tk bindings cannot
+leave the GUI process.
+"""
+import multiprocessing
+import select
+import struct
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+from activity import KEY_PRESS, ACTIVITY_NAMES
+from activity_trace import TraceRecorder
+from clock import MonotonicClock
+from decisions import DecisionTrace
+from detector import ZombieDetector, ANALYSIS_INTERVAL
+from idle import open_idle_provider, EventIdleProvider
+from input_sources import open_input_source
+
+RING_SLOTS = 1024
+STARTUP_TIMEOUT = 5.0   # Seconds to wait for the daemon to open its input source
+
+# Ring header: number of records ever written. Each slot repeats its record's
+# sequence number so a reader can tell a slot that was overwritten under it.
+HEADER = struct.Struct('<Q')
+# seq, kind, flags, zombie incidents, timestamp, score, tolerance, duration, events, reasons.
+# ACTIVITY records count the events of one kind (flags) in a batch; VERDICT
+# records carry the tick's duration in seconds.
+REASONS_SIZE = 92
+RECORD = struct.Struct(f'<QBBHdfffI{REASONS_SIZE}s')   # 128 bytes
+
+ACTIVITY, VERDICT, STATE = 1, 2, 3
+TRIGGER, WARN, SAVED = 1, 2, 4     # VERDICT flags
+
+REASON_SEPARATOR = '\x1f'
+
+DaemonRecord = namedtuple('DaemonRecord',
+                          'seq kind flags incidents timestamp score tolerance duration events reasons')
+
+
+class SharedRing:
+    """Single-writer ring of fixed-size records in shared memory
+
+    The writer fills a slot, then publishes it by bumping the header count.
+    Readers keep their own position; one that falls a whole ring behind
+    skips to the oldest record still present and counts what it lost.
+    """
+
+    def __init__(self, name=None, slots=RING_SLOTS):
+        self.slots = slots
+        size = HEADER.size + slots * RECORD.size
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.buf = self.shm.buf
+        self.written = HEADER.unpack_from(self.buf, 0)[0]
+        self.read_seq = self.written
+        self.lost = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, kind, flags=0, incidents=0, timestamp=0.0, score=0.0, tolerance=0.0, duration=0.0, events=0,
+              reasons=()):
+        seq = self.written + 1
+        text = REASON_SEPARATOR.join(reasons).encode('utf-8')[:REASONS_SIZE]
+        RECORD.pack_into(self.buf, HEADER.size + (seq - 1) % self.slots * RECORD.size,
+                         seq, kind, flags, min(incidents, 0xFFFF), timestamp, score, tolerance, duration,
+                         events, text)
+        HEADER.pack_into(self.buf, 0, seq)
+        self.written = seq
+
+    def read(self):
+        """Records published since the last read, oldest first"""
+        head = HEADER.unpack_from(self.buf, 0)[0]
+        start = max(self.read_seq, head - self.slots)
+        self.lost += start - self.read_seq
+        records = []
+        for seq in range(start + 1, head + 1):
+            fields = RECORD.unpack_from(self.buf, HEADER.size + (seq - 1) % self.slots * RECORD.size)
+            if fields[0] != seq:
+                continue
+            text = fields[-1].rstrip(b'\0').decode('utf-8', 'ignore')
+            records.append(DaemonRecord(*fields[:-1], text.split(REASON_SEPARATOR) if text else []))
+        # Drop anything the writer may have lapped while we were copying
+        head_after = HEADER.unpack_from(self.buf, 0)[0]
+        if head_after - self.slots >= start + 1:
+            fresh = [record for record in records if record.seq > head_after - self.slots]
+            self.lost += len(records) - len(fresh)
+            records = fresh
+        self.read_seq = head
+        return records
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def run_daemon(ring_name, slots, conn, settings, stats, input_backend, idle_name, record_path=None):
+    """Daemon process entry point: capture, detect, publish until told to stop"""
+    ring = SharedRing(ring_name, slots)
+    clock = MonotonicClock()
+    detector = ZombieDetector(settings, stats)
+    detector.last_activity = clock.now()
+    detector.trace = DecisionTrace()
+    detector.motion.interval = settings.get('motion_flush_interval', detector.motion.interval)
+
+    try:
+        source = open_input_source(input_backend, None, clock)
+        if source.name == 'tk':
+            raise OSError("no system-wide input source (evdev or x11) is available")
+        idle = open_idle_provider(idle_name, detector)
+        source.start_reader()
+    except Exception as e:
+        conn.send(('error', str(e)))
+        ring.close()
+        return
+    recorder = TraceRecorder(record_path) if record_path else None
+    conn.send(('ready', source.name, idle.name))
+
+    unread = 0
+
+    def publish(kind, flags=0, score=0.0, duration=0.0, events=0, timestamp=None, reasons=()):
+        nonlocal unread
+        ring.write(kind, flags, detector.zombie_incidents, clock.now() if timestamp is None else timestamp,
+                   score, detector.tolerance_level, duration, events, reasons)
+        unread += 1
+        # Activity alone does not need the GUI, but it must read (and count)
+        # the records before the ring laps them
+        if kind != ACTIVITY or unread >= ring.slots // 2:
+            conn.send(('wake',))
+            unread = 0
+
+    active = False
+    due = None
+    try:
+        while True:
+            timeout = None if due is None else max(0.0, due - clock.now())
+            readable, _, _ = select.select([conn, source.queue.read_fd], [], [], timeout)
+
+            if source.queue.read_fd in readable:
+                events = source.queue.drain()
+                if recorder:
+                    for event in events:
+                        recorder.record(*event)
+                counts = [0] * len(ACTIVITY_NAMES)
+                for event in events:
+                    counts[event[0]] += 1
+                # Typing the challenge code is not activity
+                if detector.challenge_in_progress:
+                    events = [event for event in events if event[0] != KEY_PRESS]
+                if events:
+                    detector.feed(events)
+                for kind, count in enumerate(counts):
+                    if count:
+                        publish(ACTIVITY, kind, events=count, timestamp=detector.last_activity)
+                if events:
+                    now = clock.now()
+                    if active and not detector.challenge_in_progress and (due is None or due - now > ANALYSIS_INTERVAL):
+                        due = now + ANALYSIS_INTERVAL
+
+            if conn in readable:
+                while conn.poll():
+                    command = conn.recv()
+                    if command[0] == 'stop':
+                        return
+                    if command[0] == 'sync':
+                        settings.update(command[1])
+                        detector.motion.interval = settings['motion_flush_interval']
+                        active = command[2]
+                    else:
+                        apply_command(detector, command)
+                publish(STATE)
+                due = detector.next_deadline(clock.now()) if active else None
+
+            if due is not None and clock.now() >= due:
+                now = clock.now()
+                started = time.perf_counter()
+                try:
+                    detector.observe_idle(now, idle.idle_seconds(now))
+                except Exception as e:
+                    print(f"Idle provider {idle.name} failed ({e}); falling back to input events")
+                    idle.close()
+                    idle = EventIdleProvider(detector)
+                saves = stats['tolerance_saves']
+                verdict = detector.evaluate(now)
+                flags = (TRIGGER if verdict.trigger else 0) | (WARN if verdict.warn else 0)
+                if stats['tolerance_saves'] != saves:
+                    flags |= SAVED
+                if verdict.trigger:
+                    # Pause here at once; the GUI accepts the challenge or releases it
+                    detector.begin_challenge(now)
+                publish(VERDICT, flags, verdict.score, time.perf_counter() - started, reasons=verdict.reasons)
+                due = detector.next_deadline(now) if active else None
+    except (EOFError, OSError):
+        pass  # GUI went away
+    finally:
+        source.stop()
+        idle.close()
+        if recorder:
+            recorder.close()
+        ring.close()
+
+
+def apply_command(detector, command):
+    """Replay a GUI command ('call'/'set'/'dump', ...) on the daemon's detector"""
+    if command[0] == 'call':
+        getattr(detector, command[1])(*command[2])
+    elif command[0] == 'set':
+        setattr(detector, command[1], command[2])
+    elif command[0] == 'dump':
+        # Dumps follow a challenge or false positive, so detection is paused anyway
+        try:
+            detector.trace.dump_to_dir(command[1], command[2])
+        except OSError as e:
+            print(f"Error dumping decision trace: {e}")
+
+
+class DetectorDaemon:
+    """GUI-side handle on the daemon process: commands out, ring records in"""
+
+    def __init__(self, settings, stats, input_backend, idle_name, record_path=None, slots=RING_SLOTS):
+        self.ring = SharedRing(slots=slots)
+        # spawn: the child must not inherit the GUI's Tk/X connections
+        context = multiprocessing.get_context('spawn')
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=run_daemon, name='zombie-detector', daemon=True,
+            args=(self.ring.name, slots, child_conn, dict(settings), dict(stats),
+                  input_backend, idle_name, record_path))
+        self.process.start()
+        child_conn.close()
+
+        reply = self.conn.recv() if self.conn.poll(STARTUP_TIMEOUT) else ('error', "daemon did not start")
+        if reply[0] != 'ready':
+            self.close()
+            raise OSError(reply[1])
+        self.source_name, self.idle_name = reply[1], reply[2]
+
+    def fileno(self):
+        """Readable when the daemon has published verdicts or state"""
+        return self.conn.fileno()
+
+    def send(self, *command):
+        try:
+            self.conn.send(command)
+        except OSError as e:
+            print(f"Error sending to detector daemon: {e}")
+
+    def poll(self):
+        """Consume wakeups and return new ring records; raises EOFError once the daemon is gone"""
+        while self.conn.poll():
+            self.conn.recv()
+        return self.ring.read()
+
+    def close(self):
+        try:
+            self.conn.send(('stop',))
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=1)
+        self.conn.close()
+        self.ring.close()
+
+
+class DetectorProxy:
+    """A local ZombieDetector whose state changes are also replayed in the daemon
+
+    Reads go to the local detector. Records from the daemon overwrite the
+    state it owns (tolerance, last activity) through mirror(). The incident
+    count is kept on both sides by the same calls, so it is not mirrored.
+    """
+
+    CALLS = frozenset(('reset', 'begin_challenge', 'end_challenge', 'challenge_succeeded',
+                       'challenge_failed', 'false_positive', 'challenge_timed_out'))
+    FIELDS = frozenset(('tolerance_level', 'challenge_in_progress', 'grace_period_end'))
+
+    def __init__(self, detector, daemon):
+        object.__setattr__(self, 'detector', detector)
+        object.__setattr__(self, 'daemon', daemon)
+
+    def __getattr__(self, name):
+        value = getattr(self.detector, name)
+        if name not in self.CALLS:
+            return value
+
+        def forward(*args):
+            result = value(*args)
+            self.daemon.send('call', name, args)
+            return result
+        return forward
+
+    def __setattr__(self, name, value):
+        setattr(self.detector, name, value)
+        if name in self.FIELDS:
+            self.daemon.send('set', name, value)
+
+    def accept_challenge(self, now):
+        """begin_challenge for a challenge the daemon has already begun: locally only"""
+        return self.detector.begin_challenge(now)
+
+    def release_daemon(self):
+        """Withdraw a challenge the daemon began but the GUI is not showing"""
+        self.daemon.send('call', 'withdraw_challenge', ())
+
+    def mirror(self, record):
+        self.detector.tolerance_level = record.tolerance
+        if record.kind == ACTIVITY:
+            self.detector.last_activity = record.timestamp
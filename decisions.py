@@ -0,0 +1,218 @@
+"""Per-tick decision trace for diagnosing challenges and false positives
+
+DecisionTrace keeps the inputs and outputs of the last CAPACITY analysis
+ticks (the four check_* scores, idle time and threshold, tolerance before
+and after, zombie onset time, score and decision flags) in preallocated
+typed columns, like EventRing. Recording overwrites the oldest slot in
+place. The app dumps the ring to a small self-describing binary file
+whenever a challenge is triggered or reported as a false positive. The
+GUI copies the columns (snapshot()) and leaves the file I/O to a
+DecisionDumper thread:
+
+    header    '<4sHHI'  magic, version, column count, tick count
+    columns   per column: name (16s), typecode (c), then its values oldest
+              first in native array layout, little-endian
+
+Read a dump with read_decisions(path), or print it:
+
+    python decisions.py zombie_decisions/20250101-120000-challenge.zdt
+"""
+import math
+import os
+import struct
+import sys
+from array import array
+from datetime import datetime
+
+from persistence import BackgroundWriter
+
+MAGIC = b'ZCDT'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+COLUMN_HEADER = struct.Struct('<16sc')
+CAPACITY = 512
+
+# Decision flags
+TRIGGER = 1
+WARN = 2
+IDLE_ALARM = 4      # Idle threshold reached
+SUSTAINED = 8       # Sustained-behaviour trigger
+SAVED = 16          # Tolerance absorbed the score
+PAUSED = 32         # Challenge or grace period: nothing evaluated
+
+FLAG_NAMES = ((TRIGGER, 'trigger'), (WARN, 'warn'), (IDLE_ALARM, 'idle'), (SUSTAINED, 'sustained'),
+              (SAVED, 'saved'), (PAUSED, 'paused'))
+
+# Column name -> array typecode
+COLUMNS = {
+    'time': 'd',
+    'idle': 'f',
+    'threshold': 'f',
+    'repetitive': 'f',
+    'aimless': 'f',
+    'switching': 'f',
+    'scroll': 'f',
+    'pattern_score': 'f',
+    'score': 'f',
+    'tolerance_before': 'f',
+    'tolerance': 'f',
+    'onset': 'd',       # zombie_onset_time, NaN when not tracking
+    'flags': 'B',
+}
+
+
+class DecisionTrace:
+    """Fixed-capacity ring of analysis ticks in preallocated typed columns"""
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.head = 0
+        self.count = 0
+        self.columns = {name: array(typecode, bytes(array(typecode).itemsize * capacity))
+                        for name, typecode in COLUMNS.items()}
+        c = self.columns
+        # Direct references for the record path
+        self.time, self.idle, self.threshold = c['time'], c['idle'], c['threshold']
+        self.repetitive, self.aimless, self.switching, self.scroll = (
+            c['repetitive'], c['aimless'], c['switching'], c['scroll'])
+        self.pattern_score, self.score = c['pattern_score'], c['score']
+        self.tolerance_before, self.tolerance = c['tolerance_before'], c['tolerance']
+        self.onset, self.flags = c['onset'], c['flags']
+
+    def __len__(self):
+        return self.count
+
+    def record(self, detector, now, verdict):
+        """Write one tick over the oldest slot from the detector's tick state"""
+        i = self.head
+        checks = detector.check_scores
+        self.time[i] = now
+        self.idle[i] = detector.tick_idle
+        self.threshold[i] = detector.tick_threshold
+        self.repetitive[i] = checks[0]
+        self.aimless[i] = checks[1]
+        self.switching[i] = checks[2]
+        self.scroll[i] = checks[3]
+        self.pattern_score[i] = detector.pattern_score
+        self.score[i] = verdict.score
+        self.tolerance_before[i] = detector.tick_tolerance
+        self.tolerance[i] = detector.tolerance_level
+        onset = detector.zombie_onset_time
+        self.onset[i] = math.nan if onset is None else onset
+        self.flags[i] = detector.tick_flags | (TRIGGER if verdict.trigger else 0) | (WARN if verdict.warn else 0)
+        i += 1
+        self.head = 0 if i == self.capacity else i
+        if self.count < self.capacity:
+            self.count += 1
+
+    def snapshot(self):
+        """Copies of the columns holding the recorded ticks, oldest first"""
+        start = (self.head - self.count) % self.capacity
+        end = start + self.count
+        if end <= self.capacity:
+            return {name: column[start:end] for name, column in self.columns.items()}
+        return {name: column[start:] + column[:end - self.capacity] for name, column in self.columns.items()}
+
+    def dump(self, path):
+        """Write the recorded ticks, oldest first"""
+        write_decisions(path, self.snapshot())
+
+    def dump_to_dir(self, directory, reason):
+        """Dump to directory/<local time>-<reason>.zdt and return the path"""
+        path = dump_path(directory, reason)
+        os.makedirs(directory, exist_ok=True)
+        self.dump(path)
+        return path
+
+
+def dump_path(directory, reason):
+    return os.path.join(directory, f"{datetime.now():%Y%m%d-%H%M%S}-{reason}.zdt")
+
+
+def write_decisions(path, columns):
+    """Write snapshot() columns as a dump file"""
+    count = len(next(iter(columns.values()), ()))
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(columns), count))
+        for name, column in columns.items():
+            f.write(COLUMN_HEADER.pack(name.encode(), column.typecode.encode()))
+            if sys.byteorder != 'little':
+                column = array(column.typecode, column)
+                column.byteswap()
+            f.write(column.tobytes())
+
+
+class DecisionDumper:
+    """Writes trace snapshots to a directory on a BackgroundWriter thread
+
+    dump() costs the caller one copy of the columns (a few KB); the file
+    is created and written off its thread.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.writer = BackgroundWriter(self, name='decision-dumper')
+
+    def dump(self, trace, reason):
+        self.writer.put((dump_path(self.directory, reason), trace.snapshot()))
+
+    def close(self):
+        self.writer.close()
+
+    # BackgroundWriter sink
+
+    def write(self, dumps):
+        os.makedirs(self.directory, exist_ok=True)
+        for path, columns in dumps:
+            write_decisions(path, columns)
+
+    def sync(self):
+        pass    # Diagnostics: not worth an fsync
+
+    def finish(self):
+        pass
+
+
+def read_decisions(path):
+    """Columns of a dump as {name: array}, oldest tick first"""
+    with open(path, 'rb') as f:
+        magic, version, column_count, count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} decision trace")
+        columns = {}
+        for _ in range(column_count):
+            name, typecode = COLUMN_HEADER.unpack(f.read(COLUMN_HEADER.size))
+            column = array(typecode.decode())
+            column.frombytes(f.read(column.itemsize * count))
+            if sys.byteorder != 'little':
+                column.byteswap()
+            columns[name.rstrip(b'\0').decode()] = column
+    return columns
+
+
+def format_flags(flags):
+    return ','.join(name for bit, name in FLAG_NAMES if flags & bit) or '-'
+
+
+def main():
+    if len(sys.argv) != 2:
+        print(f"usage: {sys.argv[0]} DUMP.zdt")
+        return 2
+    columns = read_decisions(sys.argv[1])
+    times = columns['time']
+    last = times[-1] if times else 0.0
+    print(f"{'t':>8} {'idle':>6} {'thresh':>6} {'rep':>5} {'aim':>5} {'click':>5} {'scroll':>6} "
+          f"{'pattern':>7} {'score':>6} {'tol':>13} {'onset':>7}  flags")
+    for i in range(len(times)):
+        onset = columns['onset'][i]
+        onset_text = '-' if math.isnan(onset) else f"{onset - last:+.1f}"
+        print(f"{times[i] - last:+8.1f} {columns['idle'][i]:6.1f} {columns['threshold'][i]:6.1f} "
+              f"{columns['repetitive'][i]:5.2f} {columns['aimless'][i]:5.2f} {columns['switching'][i]:5.2f} "
+              f"{columns['scroll'][i]:6.2f} {columns['pattern_score'][i]:7.0f} {columns['score'][i]:6.0f} "
+              f"{columns['tolerance_before'][i]:6.1f}->{columns['tolerance'][i]:5.1f} {onset_text:>7}  "
+              f"{format_flags(columns['flags'][i])}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,477 @@
+from array import array
+from collections import namedtuple
+
+from activity import (
+    EventRing, MotionCoalescer, SlidingSum, RunLengthWindow, RecentKeyCounter,
+    MOUSE_MOVE, KEY_PRESS, CLICK, SCROLL
+)
+from decisions import IDLE_ALARM, SUSTAINED, SAVED, PAUSED
+
+# Seconds the user gets to answer a challenge before it escalates
+CHALLENGE_TIMEOUT = 35
+
+# Seconds between analysis ticks while patterns are active
+ANALYSIS_INTERVAL = 0.5
+
+# Idle seconds after which idle time starts adding to the zombie score
+IDLE_SCORE_START = 10
+
+# Result of one analysis tick
+Verdict = namedtuple('Verdict', 'score reasons trigger warn')
+
+QUIET = Verdict(0, (), False, False)
+
+
+class ZombieDetector:
+    """Headless zombie detection engine
+
+    Input events go in through feed() (or the on_* methods), evaluate(now)
+    runs one analysis tick and returns a Verdict. Nothing here touches Tk,
+    so detection can be driven and timed from a plain Python process. The
+    settings and stats dicts are shared with the caller and read live.
+    """
+
+    def __init__(self, settings, stats):
+        self.settings = settings
+        self.stats = stats
+
+        self.last_activity = 0.0
+        self.zombie_incidents = 0
+        self.zombie_onset_time = None
+        self.challenge_in_progress = False
+        self.grace_period_end = 0
+
+        # Scheduling state from the last evaluate()
+        self.last_score = 0
+        self.pattern_score = 0      # Part of last_score that does not depend on idle time
+        self.last_decay = None      # When tolerance decay was last applied
+
+        # Inputs of the last evaluate(), for the optional decision trace
+        self.trace = None           # decisions.DecisionTrace, recording every tick when set
+        self.check_scores = array('d', bytes(8 * 4))    # repetitive, aimless, switching, scroll
+        self.tick_idle = 0.0
+        self.tick_threshold = 0.0
+        self.tick_tolerance = 0.0   # Before this tick's decay and depletion
+        self.tick_flags = 0
+
+        # Activity history
+        self.activity_buffer = EventRing(100)
+        self.mouse_movements = EventRing(50)
+        self.key_presses = EventRing(50)
+        self.click_patterns = EventRing(30)
+        self.scroll_patterns = EventRing(30)
+        self.motion = MotionCoalescer(settings.get('motion_flush_interval', 0.05))
+
+        # Incremental detector state, updated as events arrive
+        self.activity_count = 0
+        self.activity_runs = RunLengthWindow(10)
+        self.recent_distance = SlidingSum(10)
+        self.recent_keys = RecentKeyCounter(100)
+
+        # Tolerance system - REDUCED FOR FASTER DETECTION
+        self.tolerance_level = 30  # Reduced from 50
+        self.max_tolerance = 100
+        self.warning_given = False
+
+    # Input
+
+    def feed(self, events):
+        """Feed (kind, timestamp, x, y, delta) tuples in time order"""
+        for kind, timestamp, x, y, delta in events:
+            if kind == MOUSE_MOVE:
+                self.on_motion(timestamp, x, y)
+            elif kind == KEY_PRESS:
+                self.on_key(timestamp)
+            elif kind == CLICK:
+                self.on_click(timestamp, x, y, delta)
+            elif kind == SCROLL:
+                self.on_scroll(timestamp, delta)
+
+    def on_motion(self, timestamp, x, y):
+        """Track mouse movement patterns"""
+        self.last_activity = timestamp
+
+        # Raw motion is coalesced; the detector sees one event per flush interval
+        if self.motion.add(timestamp, x, y):
+            self.flush_motion()
+
+    def flush_motion(self):
+        """Push the pending motion aggregate into the mouse history"""
+        motion = self.motion
+        if not motion.samples:
+            return
+
+        self.mouse_movements.append(
+            motion.end_time, MOUSE_MOVE, motion.x, motion.y,
+            motion.path, motion.samples, motion.end_time - motion.start_time
+        )
+        self.recent_distance.push(motion.path)
+        self.record_activity(MOUSE_MOVE, motion.end_time)
+        motion.clear()
+
+    def on_key(self, timestamp):
+        """Track keyboard activity"""
+        self.key_presses.append(timestamp, KEY_PRESS)
+        self.record_activity(KEY_PRESS, timestamp)
+
+    def on_click(self, timestamp, x, y, button):
+        """Track click patterns"""
+        self.click_patterns.append(timestamp, CLICK, x, y, 0.0, button)
+        self.record_activity(CLICK, timestamp)
+
+    def on_scroll(self, timestamp, delta):
+        """Track scroll patterns"""
+        self.scroll_patterns.append(timestamp, SCROLL, 0, 0, 0.0, delta)
+        self.record_activity(SCROLL, timestamp)
+
+    def record_activity(self, kind, timestamp):
+        """Record activity in the activity buffer"""
+        self.last_activity = timestamp
+        self.activity_buffer.append(timestamp, kind)
+        self.activity_runs.push(kind)
+        if kind == KEY_PRESS:
+            self.recent_keys.push(timestamp, self.activity_count)
+        self.activity_count += 1
+
+        # REDUCED tolerance gain for good activity
+        if kind == KEY_PRESS:
+            self.tolerance_level = min(self.max_tolerance, self.tolerance_level + 0.2)  # Reduced from 0.5
+
+    def observe_idle(self, now, idle_seconds):
+        """Fold an external idle measurement (e.g. the X server's) into last_activity"""
+        seen = now - idle_seconds
+        if seen > self.last_activity:
+            self.last_activity = seen
+
+    def reset(self, now):
+        """Reset activity tracking"""
+        self.last_activity = now
+        self.mouse_movements.clear()
+        self.key_presses.clear()
+        self.click_patterns.clear()
+        self.scroll_patterns.clear()
+        self.activity_buffer.clear()
+        self.motion.clear()
+        self.activity_runs.clear()
+        self.recent_distance.clear()
+        self.recent_keys.clear()
+        self.zombie_incidents = max(0, self.zombie_incidents - 1)
+        self.zombie_onset_time = None
+        self.last_score = 0
+        self.pattern_score = 0
+        self.last_decay = now
+
+    # Challenge state
+
+    def in_grace_period(self, now):
+        """Check if we're still in grace period after a challenge"""
+        return now < self.grace_period_end
+
+    def start_grace_period(self, now):
+        """Start grace period after successful challenge"""
+        self.grace_period_end = now + self.settings['grace_period']
+
+    def begin_challenge(self, now):
+        """Mark a challenge as started; returns False if one is running or grace is active"""
+        if self.challenge_in_progress or self.in_grace_period(now):
+            return False
+        self.challenge_in_progress = True
+        self.zombie_incidents += 1
+        self.warning_given = False
+        return True
+
+    def withdraw_challenge(self):
+        """Undo begin_challenge for a challenge that was never shown"""
+        if self.challenge_in_progress:
+            self.challenge_in_progress = False
+            self.zombie_incidents = max(0, self.zombie_incidents - 1)
+
+    def end_challenge(self, now):
+        """Clear the challenge and start the grace period"""
+        self.challenge_in_progress = False
+        self.start_grace_period(now)
+
+    def challenge_succeeded(self, now):
+        """Correct code entered"""
+        # Restore MINIMAL tolerance
+        self.tolerance_level = min(self.max_tolerance, self.tolerance_level + 10)  # Reduced from 20
+        self.end_challenge(now)
+
+    def challenge_failed(self):
+        """Wrong code entered"""
+        self.tolerance_level = max(0, self.tolerance_level - 20)  # Increased penalty
+
+    def false_positive(self, now):
+        """User reported the challenge as a false alarm"""
+        self.tolerance_level = min(self.max_tolerance, self.tolerance_level + 15)  # Reduced from 30
+
+        # Adjust adaptive threshold
+        if self.settings['adaptive_threshold']:
+            self.settings['tolerance_decay'] = max(0.5, self.settings['tolerance_decay'] - 0.2)
+
+        self.end_challenge(now)
+
+    def challenge_timed_out(self):
+        """Challenge expired unanswered; returns the escalated code length"""
+        self.challenge_in_progress = False
+        self.zombie_incidents += 2  # Double penalty
+        return min(20, 10 + self.zombie_incidents)  # Much harder
+
+    # Analysis
+
+    def evaluate(self, now):
+        """Run one analysis tick, recording it in the decision trace if there is one"""
+        verdict = self.decide(now)
+        if self.trace is not None:
+            self.trace.record(self, now, verdict)
+        return verdict
+
+    def decide(self, now):
+        """AGGRESSIVE activity pattern analysis"""
+        self.flush_motion()
+        # Reset before any early return, so the trace never shows a previous tick's inputs
+        checks = self.check_scores
+        checks[0] = checks[1] = checks[2] = checks[3] = 0.0
+        self.pattern_score = 0
+        self.tick_idle = 0.0
+        self.tick_threshold = 0.0
+        self.tick_tolerance = self.tolerance_level
+        self.tick_flags = 0
+
+        # Skip analysis if challenge is in progress or in grace period
+        if self.challenge_in_progress or self.in_grace_period(now):
+            self.last_decay = now   # No decay while paused
+            self.tick_flags = PAUSED
+            return QUIET
+
+        # FASTER tolerance decay over time, one step per tick interval elapsed
+        # (ticks are skipped while nothing can change, so catch up here;
+        # no ticks run during a grace period, so it must not count either)
+        if self.last_decay is not None:
+            ticks = (now - max(self.last_decay, self.grace_period_end)) / ANALYSIS_INTERVAL
+            self.tolerance_level = max(0, self.tolerance_level - self.settings['tolerance_decay'] * ticks)
+        self.last_decay = now
+
+        # Check idle time - MUCH MORE AGGRESSIVE
+        idle_time = now - self.last_activity
+        self.tick_idle = idle_time
+        self.tick_threshold = self.get_idle_threshold()
+
+        # Immediate alarm for idle threshold
+        if idle_time >= self.tick_threshold:
+            self.tick_flags = IDLE_ALARM
+            return Verdict(100, [f"No activity for {int(idle_time)} seconds!"], True, False)  # Maximum zombie score
+
+        # Check for various zombie patterns - MORE AGGRESSIVE
+        zombie_score = 0
+        reasons = []
+
+        # 1. Check for repetitive actions - LOWER THRESHOLD
+        checks[0] = self.check_repetitive_actions()
+        if checks[0] > 0.5:  # Reduced from 0.7
+            zombie_score += 40
+            reasons.append("Repetitive actions detected")
+
+        # 2. Check for aimless movement - LOWER THRESHOLD
+        checks[1] = self.check_aimless_movement()
+        if checks[1] > 0.4:  # Reduced from 0.6
+            zombie_score += 35
+            reasons.append("Aimless mouse movement")
+
+        # 3. Check for rapid switching - LOWER THRESHOLD
+        checks[2] = self.check_rapid_switching()
+        if checks[2] > 0.5:  # Reduced from 0.8
+            zombie_score += 40
+            reasons.append("Rapid clicking/switching")
+
+        # 4. Check for scroll zombie behavior - LOWER THRESHOLD
+        checks[3] = self.check_scroll_zombie()
+        if checks[3] > 0.4:  # Reduced from 0.7
+            zombie_score += 35
+            reasons.append("Mindless scrolling")
+
+        self.pattern_score = zombie_score
+
+        # 5. Add score for any idle time over 10 seconds
+        if idle_time > IDLE_SCORE_START:
+            zombie_score += min(50, idle_time * 2)
+            if idle_time > 20:
+                reasons.append(f"Idle for {idle_time:.0f} seconds")
+        self.last_score = zombie_score
+
+        # Track sustained mindless behavior - REDUCED TIME
+        if zombie_score > 40:  # Reduced from 50
+            if self.zombie_onset_time is None:
+                self.zombie_onset_time = now
+            elif now - self.zombie_onset_time >= 15:  # Reduced from 60 seconds
+                self.zombie_onset_time = None
+                self.tick_flags = SUSTAINED
+                return Verdict(max(zombie_score, 80), reasons or ["Sustained mindless behavior"], True, False)
+        else:
+            self.zombie_onset_time = None
+
+        # Apply tolerance system - MORE AGGRESSIVE
+        trigger = False
+        warn = False
+        if zombie_score > 35:  # Reduced from 50
+            if self.tolerance_level > 20:  # Reduced from 30
+                # Use tolerance but deplete it faster
+                self.tolerance_level -= zombie_score * 0.8  # Increased from 0.5
+                self.stats['tolerance_saves'] += 1
+                self.tick_flags = SAVED
+                if self.settings['visual_warnings'] and not self.warning_given:
+                    warn = True
+                    self.warning_given = True
+            else:
+                trigger = True
+
+        return Verdict(zombie_score, reasons, trigger, warn)
+
+    def next_deadline(self, now):
+        """When evaluate() next has to run if no more input arrives (None while a challenge is up)
+
+        Without input the pattern checks cannot change, so unless patterns
+        are active the next interesting moment is either the idle score
+        lifting the total over the tolerance line or the idle threshold.
+        """
+        if self.challenge_in_progress:
+            return None
+        if self.in_grace_period(now):
+            return self.grace_period_end
+        if self.last_score > 35 or self.zombie_onset_time is not None:
+            return now + ANALYSIS_INTERVAL
+
+        idle_needed = max(IDLE_SCORE_START, (35 - self.pattern_score) / 2.0)
+        score_deadline = self.last_activity + idle_needed
+        if score_deadline <= now:
+            score_deadline = now + ANALYSIS_INTERVAL
+        return min(score_deadline, max(self.idle_deadline(now), now))
+
+    def idle_deadline(self, now):
+        """Time the idle threshold will be reached, accounting for tolerance decay until then"""
+        base = self.base_idle_threshold()
+        if not self.settings['adaptive_threshold']:
+            return self.last_activity + base
+
+        # threshold(t) = base * (1 + tolerance(t) / 400), tolerance(t) = tolerance - rate * (t - now)
+        rate = self.settings['tolerance_decay'] / ANALYSIS_INTERVAL
+        tolerance = self.tolerance_level
+        deadline = (self.last_activity + base + base * (tolerance + rate * now) / 400.0) / (1 + base * rate / 400.0)
+        if rate > 0 and deadline > now + tolerance / rate:
+            deadline = self.last_activity + base   # Tolerance bottoms out first
+        return deadline
+
+    def check_repetitive_actions(self):
+        """Check for repetitive actions - MORE SENSITIVE"""
+        if len(self.activity_buffer) < 5:  # Reduced from 10
+            return 0
+
+        # Longest run of consecutive same activities, tracked as they arrive
+        max_consecutive = self.activity_runs.longest()
+        return min(1.0, max_consecutive / 5.0)  # Reduced from 15.0
+
+    def check_aimless_movement(self):
+        """Check for aimless mouse movement - MORE SENSITIVE"""
+        moves = self.mouse_movements
+        if len(moves) < 5:  # Reduced from 10
+            return 0
+
+        # Each entry is a coalesced interval, so the window starts at the
+        # first raw sample of its oldest interval
+        window = min(10, len(moves))
+        total_distance = self.recent_distance.total
+        first_time = moves.newest('time', window - 1) - moves.newest('span', window - 1)
+        time_span = moves.newest('time') - first_time
+
+        if time_span < 0.5:  # Reduced from 1
+            return 0
+
+        # High movement with low keyboard activity suggests aimless browsing
+        recent_keys = self.recent_keys.count_after(first_time, self.activity_count)
+
+        movement_rate = total_distance / max(time_span, 0.1)
+        key_rate = recent_keys / max(time_span, 0.1)
+
+        if movement_rate > 50 and key_rate < 1:  # More sensitive thresholds
+            return min(1.0, movement_rate / 200.0)  # Reduced from 500.0
+
+        return 0
+
+    def check_rapid_switching(self):
+        """Check for rapid clicking/switching - MORE SENSITIVE"""
+        clicks = self.click_patterns
+        if len(clicks) < 3:  # Reduced from 5
+            return 0
+
+        window = min(5, len(clicks))  # Reduced from 10
+        time_span = clicks.newest('time') - clicks.newest('time', window - 1)
+        click_rate = window / max(time_span, 0.1)
+
+        return min(1.0, max(0, (click_rate - 1) / 2.0))  # More sensitive
+
+    def check_scroll_zombie(self):
+        """Check for mindless scrolling - MORE SENSITIVE"""
+        scrolls = self.scroll_patterns
+        if len(scrolls) < 3:  # Reduced from 5
+            return 0
+
+        window = min(8, len(scrolls))  # Reduced from 15
+        time_span = scrolls.newest('time') - scrolls.newest('time', window - 1)
+        scroll_rate = window / max(time_span, 0.1)
+
+        # Check for continuous scrolling without pauses
+        # (the gaps between consecutive scrolls telescope to the window span)
+        avg_gap = time_span / (window - 1)
+
+        if scroll_rate > 1 and avg_gap < 1:  # More sensitive
+            return min(1.0, scroll_rate / 3.0)  # Reduced from 5.0
+
+        return 0
+
+    def get_idle_threshold(self):
+        """Get AGGRESSIVE idle threshold"""
+        threshold = self.base_idle_threshold()
+
+        if self.settings['adaptive_threshold']:
+            # Less forgiving adjustment
+            threshold = threshold * (1 + self.tolerance_level / 400.0)  # Reduced impact
+
+        return threshold
+
+    def base_idle_threshold(self):
+        """Idle threshold before the adaptive tolerance adjustment"""
+        base_thresholds = {
+            'low': 60,      # Reduced from 300
+            'medium': 45,   # Reduced from 180
+            'high': 30,     # Reduced from 120
+            'extreme': 15   # New extreme mode
+        }
+
+        threshold = base_thresholds.get(self.settings['sensitivity'], 30)
+
+        if self.settings['gaming_mode']:
+            threshold *= 1.5  # Reduced multiplier from 2
+
+        return threshold
+
+    def calculate_challenge_difficulty(self, zombie_score):
+        """Calculate challenge difficulty - HARDER"""
+        base_length = 7  # Increased from 6
+
+        if zombie_score > 80:
+            base_length += 4  # Increased
+        elif zombie_score > 60:
+            base_length += 3
+        elif zombie_score > 40:
+            base_length += 2
+
+        if self.zombie_incidents > 2:
+            base_length += min(self.zombie_incidents - 1, 5)  # Harsher escalation
+
+        if self.settings['nightmare_mode']:
+            base_length += 4  # Increased from 3
+
+        if self.stats['current_streak'] > 10:  # Higher threshold for reduction
+            base_length = max(5, base_length - 1)
+
+        return min(base_length, 20)  # Can go up to 20 characters
@@ -0,0 +1,100 @@
+"""How long the user has been idle
+
+An idle provider answers idle_seconds(now). EventIdleProvider derives it
+from the detector's last_activity, i.e. from the events the input source
+delivered. XScreenSaverIdleProvider asks the X server (XScreenSaver
+extension, libXss via ctypes) for the time since the last input to any
+application: one round trip per analysis tick instead of handling every
+event. Point it at an Xvfb display to exercise it headless.
+"""
+import ctypes
+import ctypes.util
+import os
+
+
+class EventIdleProvider:
+    """Idle time as seen through the detector's own input events"""
+
+    name = 'events'
+
+    def __init__(self, detector):
+        self.detector = detector
+
+    def idle_seconds(self, now):
+        return now - self.detector.last_activity
+
+    def close(self):
+        pass
+
+
+class XScreenSaverInfo(ctypes.Structure):
+    _fields_ = [
+        ('window', ctypes.c_ulong),
+        ('state', ctypes.c_int),
+        ('kind', ctypes.c_int),
+        ('til_or_since', ctypes.c_ulong),
+        ('idle', ctypes.c_ulong),          # Milliseconds since the last input
+        ('event_mask', ctypes.c_ulong),
+    ]
+
+
+class XScreenSaverIdleProvider:
+    """Server-side idle time from the X11 XScreenSaver extension"""
+
+    name = 'xss'
+
+    def __init__(self, display_name=None):
+        x11_path = ctypes.util.find_library('X11')
+        xss_path = ctypes.util.find_library('Xss')
+        if not x11_path or not xss_path:
+            raise OSError("libX11/libXss not found")
+        self.x11 = ctypes.CDLL(x11_path)
+        self.xss = ctypes.CDLL(xss_path)
+
+        self.x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self.x11.XOpenDisplay.restype = ctypes.c_void_p
+        self.x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        self.x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        self.x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        self.x11.XFree.argtypes = [ctypes.c_void_p]
+        self.xss.XScreenSaverQueryExtension.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+        self.xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(XScreenSaverInfo)
+        self.xss.XScreenSaverQueryInfo.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XScreenSaverInfo)]
+
+        name = display_name.encode() if display_name else None
+        self.display = self.x11.XOpenDisplay(name)
+        if not self.display:
+            raise OSError(f"cannot open X display {display_name or os.environ.get('DISPLAY', '')!r}")
+        event_base, error_base = ctypes.c_int(), ctypes.c_int()
+        if not self.xss.XScreenSaverQueryExtension(self.display, ctypes.byref(event_base), ctypes.byref(error_base)):
+            self.x11.XCloseDisplay(self.display)
+            self.display = None
+            raise OSError("X server has no MIT-SCREEN-SAVER extension")
+        self.root_window = self.x11.XDefaultRootWindow(self.display)
+        self.info = self.xss.XScreenSaverAllocInfo()
+
+    def idle_seconds(self, now):
+        if not self.xss.XScreenSaverQueryInfo(self.display, self.root_window, self.info):
+            raise OSError("XScreenSaverQueryInfo failed")
+        return self.info.contents.idle / 1000.0
+
+    def close(self):
+        if self.display:
+            self.x11.XFree(self.info)
+            self.x11.XCloseDisplay(self.display)
+            self.display = None
+
+
+PROVIDERS = ('auto', 'events', 'xss')
+
+
+def open_idle_provider(name, detector):
+    """Create the requested provider; 'auto' uses XScreenSaver when an X display is available"""
+    if name in ('auto', 'xss') and (name == 'xss' or os.environ.get('DISPLAY')):
+        try:
+            return XScreenSaverIdleProvider()
+        except OSError as e:
+            print(f"Idle provider xss unavailable: {e}")
+    return EventIdleProvider(detector)
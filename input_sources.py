@@ -0,0 +1,424 @@
+"""Where activity events come from
+
+Every source delivers batches of (kind, timestamp, x, y, delta) tuples,
+the same shape ZombieDetector.feed() and activity traces use, to a sink
+callable on the Tk thread.
+
+    TkInputSource       bindings on the app's own window (any platform)
+    EvdevInputSource    system-wide, reads /dev/input/event* (Linux; needs
+                        read access, e.g. the 'input' group)
+    X11RecordInputSource  system-wide, X11 RECORD extension via the
+                        optional python-xlib package
+
+The system-wide sources run a reader thread that stamps events with the
+injected clock and pushes them in batches onto an EventQueue. The Tk
+thread only wakes when a batch arrives (a self-pipe registered with
+createfilehandler) and hands the whole batch to the sink, so per-event
+work stays off the GUI thread. Without Tk (the detector daemon),
+start_reader() runs just the thread and the caller selects on the queue's
+read_fd itself. EvdevInputSource accepts explicit device
+paths and X11RecordInputSource a display name, so both can be pointed at
+a uinput device or an Xvfb server.
+"""
+import abc
+import glob
+import os
+import select
+import struct
+import threading
+import time
+import tkinter as tk
+from collections import deque
+
+from activity import MOUSE_MOVE, KEY_PRESS, CLICK, SCROLL
+
+BATCH_INTERVAL = 0.02   # Seconds a reader thread holds events before handing them over
+MAX_BATCH = 256
+
+WHEEL_DELTA = 120       # Tk/Windows units per wheel notch
+
+
+class EventQueue:
+    """Batches from a reader thread to the Tk thread
+
+    deque.append and deque.popleft are atomic under the GIL, so producer
+    and consumer share no lock. A byte written to a pipe per batch wakes
+    the consumer's file handler.
+    """
+
+    def __init__(self):
+        self.batches = deque()
+        self.read_fd, self.write_fd = os.pipe()
+        os.set_blocking(self.read_fd, False)
+        os.set_blocking(self.write_fd, False)
+
+    def put(self, events):
+        self.batches.append(events)
+        try:
+            os.write(self.write_fd, b'\0')
+        except BlockingIOError:
+            pass  # Pipe full: the consumer has wakeups pending anyway
+
+    def drain(self):
+        """All queued events, oldest first"""
+        try:
+            while os.read(self.read_fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        events = []
+        batches = self.batches
+        while batches:
+            events.extend(batches.popleft())
+        return events
+
+    def close(self):
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+
+class TkInputSource:
+    """Events delivered to the app's own window only"""
+
+    name = 'tk'
+
+    def __init__(self, root, clock):
+        self.root = root
+        self.clock = clock
+        self.sink = None
+
+    def start(self, sink):
+        self.sink = sink
+        self.root.bind('<Motion>', self.on_motion)
+        self.root.bind('<KeyPress>', self.on_key)
+        self.root.bind('<Button-1>', self.on_click)
+        self.root.bind('<Button-3>', self.on_click)
+        self.root.bind('<MouseWheel>', self.on_scroll)
+        self.root.bind('<Button-4>', self.on_scroll)   # X11 wheel
+        self.root.bind('<Button-5>', self.on_scroll)
+        self.root.focus_set()
+
+    def stop(self):
+        for sequence in ('<Motion>', '<KeyPress>', '<Button-1>', '<Button-3>',
+                         '<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.root.unbind(sequence)
+
+    def on_motion(self, event):
+        self.sink(((MOUSE_MOVE, self.clock.now(), event.x_root, event.y_root, 0),))
+
+    def on_key(self, event):
+        self.sink(((KEY_PRESS, self.clock.now(), 0, 0, 0),))
+
+    def on_click(self, event):
+        self.sink(((CLICK, self.clock.now(), event.x_root, event.y_root, event.num),))
+
+    def on_scroll(self, event):
+        if event.num == 4:
+            delta = WHEEL_DELTA
+        elif event.num == 5:
+            delta = -WHEEL_DELTA
+        else:
+            delta = event.delta
+        self.sink(((SCROLL, self.clock.now(), 0, 0, delta),))
+
+
+class ThreadedInputSource(abc.ABC):
+    """Base for sources read on their own thread; subclasses implement read_loop()"""
+
+    name = 'threaded'
+
+    def __init__(self, root, clock):
+        self.root = root
+        self.clock = clock
+        self.queue = EventQueue()
+        self.running = False
+        self.thread = None
+        self.sink = None
+        self.pending = []
+        self.pending_since = None
+
+    def start(self, sink):
+        """Start reading; batches are delivered to sink on the Tk thread"""
+        self.sink = sink
+        self.root.tk.createfilehandler(self.queue.read_fd, tk.READABLE, self.deliver)
+        self.start_reader()
+
+    def start_reader(self):
+        """Start only the reader thread; the caller drains queue when queue.read_fd is readable"""
+        self.running = True
+        self.thread = threading.Thread(target=self.read_loop, name=f'input-{self.name}', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.interrupt()
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+        if self.sink is not None:
+            self.root.tk.deletefilehandler(self.queue.read_fd)
+        self.queue.close()
+
+    def interrupt(self):
+        """Unblock read_loop so it notices running is False"""
+
+    def deliver(self, fd, mask):
+        events = self.queue.drain()
+        if events:
+            self.sink(events)
+
+    # Reader thread side
+
+    def emit(self, event):
+        if not self.pending:
+            self.pending_since = time.monotonic()
+        self.pending.append(event)
+        if len(self.pending) >= MAX_BATCH:
+            self.flush()
+
+    def flush_due(self):
+        """Flush if the oldest pending event has waited a batch interval"""
+        if self.pending and time.monotonic() - self.pending_since >= BATCH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.queue.put(self.pending)
+            self.pending = []
+
+    @abc.abstractmethod
+    def read_loop(self):
+        """Read events until running is False, calling emit() and flush_due()"""
+
+
+# struct input_event: struct timeval, __u16 type, __u16 code, __s32 value
+INPUT_EVENT = struct.Struct('llHHi')
+EV_SYN, EV_KEY, EV_REL, EV_ABS = 0x00, 0x01, 0x02, 0x03
+SYN_REPORT = 0
+REL_X, REL_Y, REL_WHEEL = 0x00, 0x01, 0x08
+ABS_X, ABS_Y = 0x00, 0x01
+BUTTONS = {0x110: 1, 0x112: 2, 0x111: 3}   # BTN_LEFT, BTN_MIDDLE, BTN_RIGHT -> Tk button numbers
+BTN_MISC = 0x100                           # Codes from here up are buttons, not keyboard keys
+
+
+def evdev_devices():
+    """Readable event devices that report keys or relative motion"""
+    devices = []
+    for path in sorted(glob.glob('/dev/input/event*')):
+        capabilities = f"/sys/class/input/{os.path.basename(path)}/device/capabilities/ev"
+        try:
+            with open(capabilities) as f:
+                ev_bits = int(f.read().strip().split()[-1], 16)
+            if not ev_bits & ((1 << EV_KEY) | (1 << EV_REL)):
+                continue
+        except (OSError, ValueError):
+            pass  # No sysfs (containers): try the device anyway
+        if os.access(path, os.R_OK):
+            devices.append(path)
+    return devices
+
+
+class EvdevInputSource(ThreadedInputSource):
+    """System-wide input from Linux evdev devices
+
+    Relative pointer motion is integrated into a virtual position, since
+    evdev has no notion of screen coordinates. Key autorepeat is ignored.
+    The device list is fixed at startup: an unplugged device is closed and
+    dropped, and devices plugged in later are not picked up.
+    """
+
+    name = 'evdev'
+
+    def __init__(self, root, clock, paths=None):
+        super().__init__(root, clock)
+        paths = evdev_devices() if paths is None else list(paths)
+        self.fds = []
+        for path in paths:
+            try:
+                self.fds.append(os.open(path, os.O_RDONLY | os.O_NONBLOCK))
+            except OSError:
+                continue
+        if not self.fds:
+            raise OSError("no readable /dev/input/event* devices")
+        self.wake_read, self.wake_write = os.pipe()
+        self.x = 0
+        self.y = 0
+        self.moved = False
+
+    def interrupt(self):
+        try:
+            os.write(self.wake_write, b'\0')
+        except OSError:
+            pass  # Reader already finished
+
+    def read_loop(self):
+        chunk = INPUT_EVENT.size * 64
+        try:
+            while self.running:
+                readable, _, _ = select.select(self.fds + [self.wake_read], [], [],
+                                               BATCH_INTERVAL if self.pending else None)
+                for fd in readable:
+                    if fd == self.wake_read:
+                        continue
+                    try:
+                        data = os.read(fd, chunk)
+                    except BlockingIOError:
+                        continue
+                    except OSError:
+                        data = b''
+                    if not data:
+                        # Device unplugged (ENODEV) or end of file
+                        self.fds.remove(fd)
+                        os.close(fd)
+                        continue
+                    self.parse(data)
+                self.flush_due()
+            self.flush()
+        finally:
+            for fd in self.fds + [self.wake_read, self.wake_write]:
+                os.close(fd)
+
+    def parse(self, data):
+        now = self.clock.now()
+        usable = len(data) - len(data) % INPUT_EVENT.size
+        for _, _, kind, code, value in INPUT_EVENT.iter_unpack(data[:usable]):
+            if kind == EV_REL:
+                if code == REL_X:
+                    self.x += value
+                    self.moved = True
+                elif code == REL_Y:
+                    self.y += value
+                    self.moved = True
+                elif code == REL_WHEEL:
+                    self.emit((SCROLL, now, 0, 0, value * WHEEL_DELTA))
+            elif kind == EV_ABS:
+                if code == ABS_X:
+                    self.x = value
+                    self.moved = True
+                elif code == ABS_Y:
+                    self.y = value
+                    self.moved = True
+            elif kind == EV_KEY and value == 1:
+                button = BUTTONS.get(code)
+                if button is not None:
+                    self.emit((CLICK, now, self.x, self.y, button))
+                elif code < BTN_MISC:
+                    self.emit((KEY_PRESS, now, 0, 0, 0))
+            elif kind == EV_SYN and code == SYN_REPORT and self.moved:
+                self.moved = False
+                self.emit((MOUSE_MOVE, now, self.x, self.y, 0))
+
+
+class X11RecordInputSource(ThreadedInputSource):
+    """System-wide input on X11 via the RECORD extension (python-xlib)"""
+
+    name = 'x11'
+
+    def __init__(self, root, clock, display_name=None):
+        super().__init__(root, clock)
+        from Xlib import X, display
+        from Xlib.ext import record
+        from Xlib.protocol import rq
+        self.X = X
+        self.record = record
+        self.rq = rq
+        self.control = display.Display(display_name)
+        self.data = display.Display(display_name)
+        if not self.data.has_extension('RECORD'):
+            raise OSError("X server has no RECORD extension")
+        self.context = self.data.record_create_context(0, [record.AllClients], [{
+            'core_requests': (0, 0),
+            'core_replies': (0, 0),
+            'ext_requests': (0, 0, 0, 0),
+            'ext_replies': (0, 0, 0, 0),
+            'delivered_events': (0, 0),
+            'device_events': (X.KeyPress, X.MotionNotify),
+            'errors': (0, 0),
+            'client_started': False,
+            'client_died': False,
+        }])
+
+    def start_reader(self):
+        # RECORD replies arrive one event at a time, and the reader blocks in
+        # record_enable_context between them, so a second thread hands each
+        # batch over a batch interval after its first event
+        self.lock = threading.Lock()
+        self.has_pending = threading.Event()
+        self.flusher = threading.Thread(target=self.flush_loop, name='input-x11-flush', daemon=True)
+        super().start_reader()
+        self.flusher.start()
+
+    def interrupt(self):
+        self.control.record_disable_context(self.context)
+        self.control.flush()
+
+    def read_loop(self):
+        try:
+            self.data.record_enable_context(self.context, self.on_reply)  # Blocks until disabled
+        finally:
+            self.has_pending.set()  # Let flush_loop see running is False
+            self.flusher.join(timeout=1)
+            self.flush()
+            self.data.record_free_context(self.context)
+            self.data.close()
+
+    def flush_loop(self):
+        while self.running:
+            self.has_pending.wait()
+            self.has_pending.clear()
+            time.sleep(BATCH_INTERVAL)
+            self.flush()
+
+    def emit(self, event):
+        with self.lock:
+            first = not self.pending
+            self.pending.append(event)
+            if len(self.pending) >= MAX_BATCH:
+                self.queue.put(self.pending)
+                self.pending = []
+        if first:
+            self.has_pending.set()
+
+    def flush(self):
+        with self.lock:
+            if self.pending:
+                self.queue.put(self.pending)
+                self.pending = []
+
+    def on_reply(self, reply):
+        if reply.category != self.record.FromServer or reply.client_swapped or not reply.data:
+            return
+        X = self.X
+        now = self.clock.now()
+        data = reply.data
+        while data:
+            event, data = self.rq.EventField(None).parse_binary_value(data, self.data.display, None, None)
+            if event.type == X.MotionNotify:
+                self.emit((MOUSE_MOVE, now, event.root_x, event.root_y, 0))
+            elif event.type == X.KeyPress:
+                self.emit((KEY_PRESS, now, 0, 0, 0))
+            elif event.type == X.ButtonPress:
+                if event.detail in (4, 5):
+                    self.emit((SCROLL, now, 0, 0, WHEEL_DELTA if event.detail == 4 else -WHEEL_DELTA))
+                else:
+                    self.emit((CLICK, now, event.root_x, event.root_y, event.detail))
+
+
+BACKENDS = ('auto', 'tk', 'evdev', 'x11')
+
+
+def open_input_source(backend, root, clock):
+    """Create the requested source; 'auto' prefers system-wide ones and falls back to Tk"""
+    if backend == 'tk':
+        return TkInputSource(root, clock)
+    candidates = ['x11', 'evdev'] if backend == 'auto' else [backend]
+    for name in candidates:
+        try:
+            if name == 'x11':
+                if not os.environ.get('DISPLAY'):
+                    raise OSError("DISPLAY is not set")
+                return X11RecordInputSource(root, clock)
+            if name == 'evdev':
+                return EvdevInputSource(root, clock)
+        except Exception as e:
+            print(f"Input backend {name} unavailable: {e}")
+    return TkInputSource(root, clock)
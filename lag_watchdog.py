@@ -0,0 +1,95 @@
+"""Event-loop lag watchdog for the Tk thread
+
+Every named timer reports how late it fired (TimerService.lag_observer);
+those lags go into a histogram. A monitor thread watches the earliest
+pending timer deadline: once a timer is overdue by more than the
+threshold the Tk thread is stuck in something, so the monitor captures
+that thread's stack right then, together with the timer or asyncio task
+that was running, and reports it once per stall. The watchdog adds no
+timers of its own, so an idle app stays idle: the monitor sleeps until
+the next deadline and, with no timers pending, until one is scheduled.
+Stalls are only detected while some timer is pending.
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque, namedtuple
+
+STALL_THRESHOLD = 0.25      # Seconds overdue before a stall is reported
+MAX_STALLS = 20             # Reports kept in memory
+
+Stall = namedtuple('Stall', 'started lag active stack')
+
+
+class LagWatchdog:
+    def __init__(self, timers, lag_histogram=None, stall_counter=None, threshold=STALL_THRESHOLD):
+        self.timers = timers
+        self.lag_histogram = lag_histogram
+        self.stall_counter = stall_counter
+        self.threshold = threshold
+        self.wakeup = threading.Event()     # Set when a timer is scheduled, or on stop
+        self.stalls = deque(maxlen=MAX_STALLS)
+        self.worst_lag = 0.0
+        self.tk_ident = None
+        self.running = False
+        self.thread = None
+        self.reported_due = None
+
+    def start(self):
+        """Call on the Tk thread"""
+        self.tk_ident = threading.get_ident()
+        self.timers.lag_observer = self.observe
+        self.timers.schedule_observer = self.wakeup.set
+        self.running = True
+        self.thread = threading.Thread(target=self.monitor, name='lag-watchdog', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.timers.lag_observer = None
+        self.timers.schedule_observer = None
+        self.wakeup.set()
+
+    def observe(self, name, lag):
+        """A timer fired lag seconds after its deadline (Tk thread)"""
+        if self.lag_histogram is not None:
+            self.lag_histogram.observe(max(0.0, lag))
+        if lag > self.worst_lag:
+            self.worst_lag = lag
+
+    def earliest_due(self):
+        """Deadline of the next pending timer in loop time, or None"""
+        return min((entry[1] for entry in list(self.timers.handles.values())), default=None)
+
+    def monitor(self):
+        loop = self.timers.loop
+        while self.running:
+            due = self.earliest_due()
+            if due is None:
+                wait = None     # Nothing can be late until a timer is scheduled
+            else:
+                lag = loop.time() - due
+                if lag < self.threshold:
+                    wait = self.threshold - lag
+                else:
+                    if due != self.reported_due:
+                        self.reported_due = due
+                        self.report(lag, loop)
+                    wait = self.threshold   # Until the stuck timer has fired
+            self.wakeup.wait(wait)
+            self.wakeup.clear()
+
+    def report(self, lag, loop):
+        frame = sys._current_frames().get(self.tk_ident)
+        stack = ''.join(traceback.format_stack(frame)) if frame is not None else ''
+        active = self.timers.current
+        if active is None:
+            task = asyncio.current_task(loop)
+            active = f"task {task.get_name()}" if task is not None else "Tk event handler"
+        stall = Stall(time.time(), lag, active, stack)
+        self.stalls.append(stall)
+        if self.stall_counter is not None:
+            self.stall_counter.inc()
+        print(f"Event loop stalled for {lag:.2f}s+ in {active}:\n{stack}", end='')
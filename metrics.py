@@ -0,0 +1,239 @@
+"""In-process metrics with Prometheus text exposition
+
+Counters, gauges and histograms cheap enough for the hot path: recording
+is an attribute add (histograms: a bisect over fixed bucket bounds plus
+two adds). Labelled families hand out one child per label set; callers
+look children up once and keep them, so the per-event cost stays a
+single add. Values are plain Python numbers touched from the Tk thread;
+exporters read them from other threads without locking, so a scrape may
+be a fraction of an observation stale, never corrupt.
+
+Export:
+    write_textfile(path)     atomic rename, for node_exporter's textfile
+                             collector (--metrics-file)
+    MetricsServer(port)      GET /metrics on 127.0.0.1 (--metrics-port)
+"""
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from activity import ACTIVITY_NAMES
+from persistence import OUTCOMES
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; handlers on the Tk thread should stay well under a frame
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+SCORE_BUCKETS = (10, 20, 35, 50, 60, 80, 100)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_labels(names, values):
+    pairs = [f'{name}="{escape(str(value))}"' for name, value in zip(names, values)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def escape(text):
+    return text.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+class Counter:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self, name, labels):
+        yield name + '_total', labels, self.value
+
+
+class Gauge:
+    __slots__ = ('value', 'function')
+
+    def __init__(self):
+        self.value = 0
+        self.function = None
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def set_function(self, function):
+        """Read the value from function() at export time instead (no hot-path cost)"""
+        self.function = function
+
+    def samples(self, name, labels):
+        yield name, labels, self.function() if self.function is not None else self.value
+
+
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # Last slot: above the highest bound
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            cumulative += count
+            yield name + '_bucket', labels + (('le', format_value(bound)),), cumulative
+        yield name + '_sum', labels, self.sum
+        yield name + '_count', labels, self.count
+
+
+class Family:
+    """A metric name with its help text and one child per label set"""
+
+    def __init__(self, kind, name, help_text, label_names, factory):
+        self.kind = kind
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.factory = factory
+        self.children = {}
+        if not self.label_names:
+            self.children[()] = factory()
+
+    def labels(self, *values):
+        """The child for these label values; keep it rather than looking it up per event"""
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = self.factory()
+        return child
+
+    def __getattr__(self, name):
+        # Unlabelled families act as their single child
+        if name == 'children':
+            raise AttributeError(name)
+        return getattr(self.children[()], name)
+
+    def expose(self):
+        # Counter samples end in _total; typing the bare name would leave them untyped in format 0.0.4
+        name = self.name + '_total' if self.kind == 'counter' else self.name
+        lines = [f"# HELP {name} {self.help}", f"# TYPE {name} {self.kind}"]
+        for values, child in list(self.children.items()):
+            base = tuple(zip(self.label_names, map(str, values)))
+            for sample, labels, value in child.samples(self.name, base):
+                names = [name for name, _ in labels]
+                label_values = [value for _, value in labels]
+                lines.append(f"{sample}{format_labels(names, label_values)} {format_value(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self, prefix='zombiecheck_'):
+        self.prefix = prefix
+        self.families = {}
+
+    def register(self, kind, name, help_text, label_names, factory):
+        name = self.prefix + name
+        if name in self.families:
+            raise ValueError(f"metric {name} already registered")
+        family = self.families[name] = Family(kind, name, help_text, label_names, factory)
+        return family
+
+    def counter(self, name, help_text, label_names=()):
+        return self.register('counter', name, help_text, label_names, Counter)
+
+    def gauge(self, name, help_text, label_names=()):
+        return self.register('gauge', name, help_text, label_names, Gauge)
+
+    def histogram(self, name, help_text, bounds=LATENCY_BUCKETS, label_names=()):
+        bounds = tuple(bounds)
+        return self.register('histogram', name, help_text, label_names, lambda: Histogram(bounds))
+
+    def expose(self):
+        """Prometheus text exposition format"""
+        lines = []
+        for family in list(self.families.values()):
+            lines.extend(family.expose())
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        """Write the exposition atomically (readers never see a partial file)"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.expose())
+        os.replace(tmp_path, path)
+
+
+class MetricsServer:
+    """GET /metrics on a loopback port, served from a daemon thread"""
+
+    def __init__(self, registry, port, host='127.0.0.1'):
+        registry_ = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry_.expose().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes are not worth a line on stdout
+
+        self.server = ThreadingHTTPServer((host, port), Handler)   # OSError if the port is taken
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name='metrics-http', daemon=True)
+        self.thread.start()
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class AppMetrics:
+    """The instruments ZombieCheck records, on one registry"""
+
+    def __init__(self, registry=None):
+        self.registry = registry if registry is not None else Registry()
+        r = self.registry
+        events = r.counter('input_events', "Input events handled, by type", ['kind'])
+        self.events = [events.labels(name) for name in ACTIVITY_NAMES]   # Indexed by activity kind
+        # Unlabelled families are unwrapped to their child: no indirection when recording
+        self.tick_seconds = r.histogram('analysis_tick_seconds', "Duration of one analyze_activity_patterns tick").labels()
+        self.score = r.histogram('detector_score', "Zombie score per analysis tick", SCORE_BUCKETS).labels()
+        challenges = r.counter('challenges', "Challenges by outcome", ['outcome'])
+        self.challenges = {outcome: challenges.labels(outcome) for outcome in OUTCOMES}
+        self.save_seconds = r.histogram('save_stats_seconds', "Time save_stats blocks the Tk thread").labels()
+        self.tolerance = r.gauge('tolerance_level', "Current tolerance (0-100)").labels()
+        self.loop_lag = r.histogram('loop_lag_seconds', "How late Tk-thread timers fire after their deadline",
+                                    LAG_BUCKETS).labels()
+        self.loop_stalls = r.counter('loop_stalls', "Tk-thread stalls longer than the watchdog threshold").labels()
+
+    def count_events(self, events):
+        counters = self.events
+        for event in events:
+            counters[event[0]].value += 1
@@ -0,0 +1,464 @@
+"""Crash-safe persistence off the Tk thread
+
+StatsJournal replaces rewriting zombie_stats.json on every change. Each
+save appends one JSON line holding only the stats and settings that
+changed, tagged with a sequence number. A BackgroundWriter thread does
+the file I/O and covers many appends with one fsync. Every compact_every
+records the journal is folded into the snapshot (zombie_stats.json,
+same format as before) via write-to-temp + fsync + os.replace, and then
+truncated. On startup recover() loads the snapshot and replays journal
+records newer than it, dropping a torn final line.
+
+InterventionHistory keeps one row per intervention and challenge result
+in a SQLite database for time-range queries, written the same way.
+"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+
+SNAPSHOT_VERSION = '2.2-aggressive'
+
+_CLOSE = object()
+_MISSING = object()
+
+
+class BackgroundWriter:
+    """Runs a sink's blocking I/O on its own thread
+
+    put() never blocks the caller. The thread hands queued items to
+    sink.write(batch) in arrival order and calls sink.sync() at most once
+    per sync_interval, plus once more on close(), so one fsync covers
+    every item written since the last one. sink.finish() runs last.
+    """
+
+    def __init__(self, sink, sync_interval=1.0, max_batch=256, name='background-writer'):
+        self.sink = sink
+        self.sync_interval = sync_interval
+        self.max_batch = max_batch
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def put(self, item):
+        self.queue.put(item)
+
+    def close(self, timeout=5.0):
+        """Write and sync everything queued so far, then stop the thread"""
+        if self.thread.is_alive():
+            self.queue.put(_CLOSE)
+            self.thread.join(timeout)
+
+    def _run(self):
+        unsynced_since = None
+        closing = False
+        while not closing:
+            timeout = None
+            if unsynced_since is not None:
+                timeout = max(0.0, unsynced_since + self.sync_interval - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                self._sync()
+                unsynced_since = None
+                continue
+
+            batch = []
+            while True:
+                if item is _CLOSE:
+                    closing = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self.sink.write(batch)
+                except Exception as e:
+                    print(f"Error in {self.thread.name}: {e}")
+                if unsynced_since is None:
+                    unsynced_since = time.monotonic()
+            if unsynced_since is not None and (closing or time.monotonic() - unsynced_since >= self.sync_interval):
+                self._sync()
+                unsynced_since = None
+
+        try:
+            self.sink.finish()
+        except Exception as e:
+            print(f"Error closing {self.thread.name}: {e}")
+
+    def _sync(self):
+        try:
+            self.sink.sync()
+        except Exception as e:
+            print(f"Error in {self.thread.name}: {e}")
+
+
+def fsync_directory(path):
+    """Make a rename in path durable (a no-op where directories can't be opened)"""
+    try:
+        fd = os.open(path or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def apply_record(state, record):
+    for section in ('stats', 'settings'):
+        if section in record:
+            state.setdefault(section, {}).update(record[section])
+    if 'tolerance_level' in record:
+        state['tolerance_level'] = record['tolerance_level']
+    state['seq'] = record['seq']
+
+
+class StatsJournal:
+    """Append-only journal of stats/settings changes with snapshot compaction
+
+    Call recover() once before the first record(). record() runs on the
+    caller's thread and only diffs and enqueues; close() flushes, compacts
+    and stops the writer.
+    """
+
+    def __init__(self, snapshot_path='zombie_stats.json', journal_path=None,
+                 compact_every=500, sync_interval=1.0):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + '.journal'
+        self.compact_every = compact_every
+        self.sync_interval = sync_interval
+        self.seq = 0
+        self.recorded = {'stats': {}, 'settings': {}, 'tolerance_level': None}
+        self.writer = None
+
+        # Writer thread state
+        self.state = {}
+        self.file = None
+        self.since_compaction = 0
+
+    def recover(self):
+        """Snapshot plus replayed journal tail, as a zombie_stats.json-shaped dict"""
+        state = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                state = json.load(f)
+        state.setdefault('seq', 0)
+
+        replayed = 0
+        if os.path.exists(self.journal_path):
+            valid_bytes = 0
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # Torn final write
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+                    if record.get('seq', 0) > state['seq']:
+                        apply_record(state, record)
+                        replayed += 1
+            if valid_bytes < os.path.getsize(self.journal_path):
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(valid_bytes)
+
+        self.seq = state['seq']
+        self.recorded = {
+            'stats': dict(state.get('stats', {})),
+            'settings': dict(state.get('settings', {})),
+            'tolerance_level': state.get('tolerance_level'),
+        }
+        self.state = json.loads(json.dumps(state))
+        self.since_compaction = replayed
+        return state
+
+    def record(self, stats, settings, tolerance_level):
+        """Journal whatever changed since the last record(); returns False if nothing did"""
+        record = {}
+        for section, values in (('stats', stats), ('settings', settings)):
+            previous = self.recorded[section]
+            changed = {key: value for key, value in values.items() if previous.get(key, _MISSING) != value}
+            if changed:
+                previous.update(changed)
+                record[section] = changed
+        if tolerance_level != self.recorded['tolerance_level']:
+            self.recorded['tolerance_level'] = tolerance_level
+            record['tolerance_level'] = tolerance_level
+        if not record:
+            return False
+
+        self.seq += 1
+        record['seq'] = self.seq
+        if self.writer is None:
+            self.writer = BackgroundWriter(self, self.sync_interval, name='stats-journal')
+        self.writer.put(record)
+        return True
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    # Sink interface, called on the writer thread
+
+    def write(self, records):
+        if self.file is None:
+            self.file = open(self.journal_path, 'a', encoding='utf-8')
+        self.file.write(''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records))
+        for record in records:
+            apply_record(self.state, record)
+        self.since_compaction += len(records)
+
+    def sync(self):
+        if self.file is not None:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        if self.since_compaction >= self.compact_every:
+            self.compact()
+
+    def finish(self):
+        if self.since_compaction:
+            self.compact()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def compact(self):
+        """Fold the journal into the snapshot atomically, then truncate the journal"""
+        snapshot = dict(self.state)
+        snapshot['last_updated'] = datetime.now().isoformat()
+        snapshot['version'] = SNAPSHOT_VERSION
+        temp_path = self.snapshot_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(snapshot, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        fsync_directory(os.path.dirname(self.snapshot_path))
+
+        # A crash before this point leaves records the snapshot already covers; their seqs are skipped
+        if self.file is None:
+            self.file = open(self.journal_path, 'a', encoding='utf-8')
+        self.file.seek(0)
+        self.file.truncate()
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.since_compaction = 0
+
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interventions (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    score REAL,
+    code_length INTEGER,
+    response_time REAL,
+    reasons TEXT
+);
+CREATE INDEX IF NOT EXISTS interventions_by_time ON interventions (timestamp, outcome);
+CREATE INDEX IF NOT EXISTS interventions_by_outcome ON interventions (outcome, timestamp);
+CREATE TABLE IF NOT EXISTS rollups (
+    granularity TEXT NOT NULL,
+    bucket REAL NOT NULL,
+    triggered INTEGER NOT NULL DEFAULT 0,
+    success INTEGER NOT NULL DEFAULT 0,
+    failure INTEGER NOT NULL DEFAULT 0,
+    timeout INTEGER NOT NULL DEFAULT 0,
+    false_positive INTEGER NOT NULL DEFAULT 0,
+    response_time_sum REAL NOT NULL DEFAULT 0,
+    rt_lt5 INTEGER NOT NULL DEFAULT 0,
+    rt_lt10 INTEGER NOT NULL DEFAULT 0,
+    rt_lt20 INTEGER NOT NULL DEFAULT 0,
+    rt_lt35 INTEGER NOT NULL DEFAULT 0,
+    rt_ge35 INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (granularity, bucket)
+) WITHOUT ROWID;
+"""
+
+OUTCOMES = ('triggered', 'success', 'failure', 'timeout', 'false_positive')
+
+# Rollup buckets start on local-time boundaries
+GRANULARITIES = ('minute', 'hour', 'day')
+RESPONSE_BUCKETS = (5, 10, 20, 35)  # Upper bounds (s) of the response-time histogram bins
+RESPONSE_COLUMNS = tuple(f'rt_lt{bound}' for bound in RESPONSE_BUCKETS) + (f'rt_ge{RESPONSE_BUCKETS[-1]}',)
+ROLLUP_COLUMNS = OUTCOMES + ('response_time_sum',) + RESPONSE_COLUMNS
+
+_UPSERT_ROLLUP = (
+    f"INSERT INTO rollups (granularity, bucket, {', '.join(ROLLUP_COLUMNS)}) "
+    f"VALUES (?, ?, {', '.join('?' * len(ROLLUP_COLUMNS))}) "
+    f"ON CONFLICT (granularity, bucket) DO UPDATE SET "
+    + ', '.join(f'{column} = {column} + excluded.{column}' for column in ROLLUP_COLUMNS)
+)
+
+
+@lru_cache(maxsize=4096)
+def _local_buckets(minute):
+    """(hour start, day start) in local time for the minute starting at minute"""
+    local = time.localtime(minute)
+    offset = local.tm_gmtoff
+    hour = float(int((minute + offset) // 3600) * 3600 - offset)
+    day = time.mktime((local.tm_year, local.tm_mon, local.tm_mday, 0, 0, 0, 0, 0, -1))
+    return hour, day
+
+
+def bucket_starts(timestamp):
+    """Starts (Unix time) of the local minute, hour and day containing timestamp"""
+    minute = float(int(timestamp // 60) * 60)
+    return (minute,) + _local_buckets(minute)
+
+
+def rollup_increments(rows):
+    """{(granularity, bucket): [column increments]} for (timestamp, outcome, ..., response_time, ...) rows"""
+    increments = {}
+    success_column = ROLLUP_COLUMNS.index('success')
+    sum_column = ROLLUP_COLUMNS.index('response_time_sum')
+    for timestamp, outcome, _, _, response_time, _ in rows:
+        column = OUTCOMES.index(outcome)
+        histogram_column = None
+        if column == success_column and response_time is not None:
+            histogram_column = sum_column + 1 + sum(response_time >= bound for bound in RESPONSE_BUCKETS)
+        for granularity, bucket in zip(GRANULARITIES, bucket_starts(timestamp)):
+            key = (granularity, bucket)
+            counts = increments.get(key)
+            if counts is None:
+                counts = increments[key] = [0] * len(ROLLUP_COLUMNS)
+            counts[column] += 1
+            if histogram_column is not None:
+                counts[sum_column] += response_time
+                counts[histogram_column] += 1
+    return increments
+
+
+class InterventionHistory:
+    """Per-event intervention history in SQLite (WAL mode)
+
+    record() only enqueues; the writer thread inserts batches and commits
+    once per sync interval, so a burst of events costs one transaction.
+    The same transaction UPSERTs minute, hour and day rollup rows, so
+    trend views read a handful of pre-aggregated rows instead of raw
+    history.
+    Queries use a separate read connection on the caller's thread and see
+    everything committed so far. Timestamps are Unix time.
+    """
+
+    def __init__(self, path='zombie_history.db', sync_interval=1.0):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.writer = None
+        self.reader = None
+        self.connection = None  # Writer thread's connection
+
+    def record(self, outcome, score=None, code_length=None, response_time=None, reasons=(), timestamp=None):
+        if outcome not in OUTCOMES:
+            raise ValueError(f"unknown outcome {outcome!r}")
+        row = (time.time() if timestamp is None else timestamp, outcome, score, code_length,
+               response_time, ', '.join(reasons) if reasons else None)
+        if self.writer is None:
+            self.writer = BackgroundWriter(self, self.sync_interval, name='intervention-history')
+        self.writer.put(row)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.executescript(HISTORY_SCHEMA)
+        return connection
+
+    # Sink interface, called on the writer thread
+
+    def write(self, rows):
+        if self.connection is None:
+            self.connection = self._connect()
+            self._backfill_rollups()
+        self.connection.executemany(
+            'INSERT INTO interventions (timestamp, outcome, score, code_length, response_time, reasons) '
+            'VALUES (?, ?, ?, ?, ?, ?)', rows)
+        self._add_rollups(rows)
+
+    def _add_rollups(self, rows):
+        increments = rollup_increments(rows)
+        self.connection.executemany(
+            _UPSERT_ROLLUP, [(granularity, bucket, *counts) for (granularity, bucket), counts in increments.items()])
+
+    def _backfill_rollups(self):
+        """Build rollups for history recorded before they existed"""
+        if self.connection.execute('SELECT 1 FROM rollups LIMIT 1').fetchone():
+            return
+        cursor = self.connection.execute(
+            'SELECT timestamp, outcome, score, code_length, response_time, reasons FROM interventions')
+        while True:
+            rows = cursor.fetchmany(10000)
+            if not rows:
+                break
+            self._add_rollups(rows)
+
+    def sync(self):
+        if self.connection is not None:
+            self.connection.commit()
+
+    def finish(self):
+        if self.connection is not None:
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
+
+    # Queries
+
+    def query(self, sql, parameters=()):
+        if self.reader is None:
+            self.reader = self._connect()
+        return self.reader.execute(sql, parameters).fetchall()
+
+    def interventions_per_hour(self, since, until=None, outcome='triggered'):
+        """[(hour start, count)] for hours in [since, until) that had any"""
+        return self.query(
+            'SELECT CAST(timestamp / 3600 AS INTEGER) * 3600 AS hour, COUNT(*) FROM interventions '
+            'WHERE outcome = ? AND timestamp >= ? AND timestamp < ? GROUP BY hour ORDER BY hour',
+            (outcome, since, float('inf') if until is None else until))
+
+    def outcome_counts(self, since, until=None):
+        """{outcome: count} over [since, until)"""
+        return dict(self.query(
+            'SELECT outcome, COUNT(*) FROM interventions '
+            'WHERE timestamp >= ? AND timestamp < ? GROUP BY outcome',
+            (since, float('inf') if until is None else until)))
+
+    def rollups(self, granularity, since, until=None):
+        """Rollup rows as dicts (bucket plus ROLLUP_COLUMNS) for buckets starting in [since, until)"""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"unknown granularity {granularity!r}")
+        rows = self.query(
+            f"SELECT bucket, {', '.join(ROLLUP_COLUMNS)} FROM rollups "
+            f"WHERE granularity = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+            (granularity, since, float('inf') if until is None else until))
+        return [dict(zip(('bucket',) + ROLLUP_COLUMNS, row)) for row in rows]
+
+    def average_response_time(self, since, until=None):
+        rows = self.query(
+            "SELECT AVG(response_time) FROM interventions "
+            "WHERE outcome = 'success' AND timestamp >= ? AND timestamp < ?",
+            (since, float('inf') if until is None else until))
+        return rows[0][0]
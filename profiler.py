@@ -0,0 +1,102 @@
+"""Low-overhead sampling profiler for real sessions (--profile)
+
+A daemon thread wakes every interval, reads every other thread's current
+stack with sys._current_frames() and counts it. Nothing is traced, so
+the profiled threads run at full speed; the cost is the sampler's own
+wakeups, reported at the end as a share of wall time.
+
+Output:
+    PATH                collapsed stacks ("thread;file:func;... count"),
+                        the input format of flamegraph.pl / speedscope
+    PATH.summary.txt    per-function self and inclusive sample shares
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+SAMPLE_INTERVAL = 0.005   # Seconds between samples (~200 Hz)
+MAX_DEPTH = 128
+
+
+class SamplingProfiler:
+    def __init__(self, path, interval=SAMPLE_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.stacks = Counter()
+        self.labels = {}            # code object -> "file:func"
+        self.samples = 0
+        self.sampling_time = 0.0    # Seconds spent inside sample()
+        self.started = None
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name='profiler', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while self.running:
+            time.sleep(self.interval)
+            start = time.perf_counter()
+            self.sample()
+            self.sampling_time += time.perf_counter() - start
+
+    def sample(self):
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        labels = self.labels
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+                stack.append(label)
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            stack.reverse()
+            self.stacks[';'.join(stack)] += 1
+        self.samples += 1
+
+    def stop(self):
+        """Stop sampling and write the collapsed stacks and the summary"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+        wall = time.perf_counter() - self.started
+        with open(self.path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        summary_path = f"{self.path}.summary.txt"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(self.summary(wall)) + "\n")
+        print(f"Profile: {self.samples} samples over {wall:.1f}s written to {self.path} and {summary_path}")
+
+    def summary(self, wall):
+        """Per-function self/inclusive shares of all thread samples"""
+        own = Counter()
+        inclusive = Counter()
+        total = sum(self.stacks.values()) or 1
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')[1:]   # Drop the thread name
+            if frames:
+                own[frames[-1]] += count
+            for label in set(frames):
+                inclusive[label] += count
+
+        lines = [
+            f"{self.samples} samples every {self.interval * 1000:g}ms over {wall:.1f}s; "
+            f"sampler overhead {self.sampling_time / max(wall, 1e-9):.2%} of one core",
+            "",
+            f"{'self':>7} {'incl':>7}  function",
+        ]
+        for label, count in inclusive.most_common():
+            lines.append(f"{own[label] / total:7.2%} {count / total:7.2%}  {label}")
+        return lines
@@ -0,0 +1,75 @@
+"""Replay a recorded activity trace through the detector
+
+    python app.py --record session.zct      # capture a real session
+    python replay.py session.zct            # unthrottled
+    python replay.py session.zct --speed 10 # 10x real time
+
+Every challenge the detector would have raised is printed with its time
+offset, score and reasons, followed by detector throughput.
+"""
+import argparse
+import time
+
+from activity_trace import read_trace
+from clock import VirtualClock
+from detector import ZombieDetector
+from simulate import Session, answer_after, DEFAULT_SETTINGS, DEFAULT_STATS
+
+
+def replay(events, settings=None, speed=None, response_time=5.0):
+    """Drive a fresh detector from an event iterable; returns (session, events fed, wall seconds)
+
+    speed=None replays as fast as possible, otherwise the trace is paced
+    at speed times real time.
+    """
+    detector = ZombieDetector(dict(settings or DEFAULT_SETTINGS), dict(DEFAULT_STATS))
+    clock = None
+    session = None
+    fed = 0
+    started = time.perf_counter()
+
+    for event in events:
+        timestamp = event[1]
+        if session is None:
+            clock = VirtualClock(timestamp)
+            detector.last_activity = timestamp
+            session = Session(detector, clock, answer_after(response_time))
+            first = timestamp
+        if speed:
+            delay = (timestamp - first) / speed - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+        session.advance_to(timestamp)
+        session.feed(event)
+        fed += 1
+
+    if session is not None:
+        session.advance_to(clock.now() + 0.5)   # Let the final tick see the last events
+    return session, fed, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a ZombieCheck activity trace")
+    parser.add_argument('trace')
+    parser.add_argument('--speed', type=float, default=None,
+                        help="replay at this multiple of real time (default: unthrottled)")
+    parser.add_argument('--sensitivity', default='medium', choices=['low', 'medium', 'high', 'extreme'])
+    parser.add_argument('--response-time', type=float, default=5.0,
+                        help="seconds the simulated user takes to answer each challenge")
+    args = parser.parse_args()
+
+    settings = dict(DEFAULT_SETTINGS, sensitivity=args.sensitivity)
+    session, fed, elapsed = replay(read_trace(args.trace), settings, args.speed, args.response_time)
+    if session is None:
+        print("Trace is empty")
+        return
+
+    for when, score, reasons, code_length in session.triggers:
+        print(f"{when - session.start_time:10.1f}s  score {score:5.1f}  code {code_length:2d}  {', '.join(reasons[:3])}")
+    rate = fed / elapsed if elapsed > 0 else float('inf')
+    print(f"\n{len(session.triggers)} challenges, {session.escalations} escalations from {fed} events "
+          f"in {elapsed:.2f}s ({rate:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Fast-forward simulation of a monitoring session on a virtual clock
+
+    python simulate.py --hours 8 --seed 1
+
+Drives the headless detector through the same deadline-scheduled analysis
+ticks, challenge timers and grace periods the GUI uses, with a synthetic user
+alternating between working, browsing and idling.
+"""
+import argparse
+import random
+import time
+
+from activity import MOUSE_MOVE, KEY_PRESS, CLICK, SCROLL
+from clock import VirtualClock
+from detector import ZombieDetector, CHALLENGE_TIMEOUT, ANALYSIS_INTERVAL
+
+DEFAULT_SETTINGS = {
+    'sensitivity': 'medium',
+    'tolerance_decay': 0.8,
+    'nightmare_mode': False,
+    'gaming_mode': False,
+    'visual_warnings': True,
+    'adaptive_threshold': True,
+    'grace_period': 30,
+    'motion_flush_interval': 0.05
+}
+
+DEFAULT_STATS = {
+    'total_interventions': 0,
+    'today_interventions': 0,
+    'today_date': '',
+    'longest_streak': 0,
+    'current_streak': 0,
+    'avg_response_time': 0,
+    'false_positives': 0,
+    'successful_detections': 0,
+    'tolerance_saves': 0,
+    'daily_productivity_score': 100
+}
+
+
+def answer_after(seconds):
+    """Responder that always types the code correctly after a fixed delay"""
+    return lambda session, code_length: seconds
+
+
+class Session:
+    """Runs analysis ticks and the challenge lifecycle against a clock
+
+    Ticks are scheduled from the detector's next_deadline() exactly like
+    the GUI timer. Call advance_to(t) and then feed() for each event;
+    advance_to processes every tick, challenge answer and challenge
+    timeout due up to t in order. The responder is called when a
+    challenge appears and returns the seconds until a correct answer, or
+    None to let it time out.
+    """
+
+    def __init__(self, detector, clock, responder=None):
+        self.detector = detector
+        self.clock = clock
+        self.responder = responder or answer_after(5.0)
+        self.start_time = clock.now()
+        self.next_tick = self.start_time + ANALYSIS_INTERVAL
+        self.answer_at = None
+        self.challenge_deadline = None
+        self.challenge_start = None
+        self.triggers = []      # (time, score, reasons, code_length)
+        self.escalations = 0
+        self.warnings = 0
+        self.ticks = 0
+
+    def advance_to(self, timestamp):
+        """Process everything due up to timestamp, then move the clock there"""
+        while True:
+            due = self.next_tick if self.next_tick is not None else float('inf')
+            if self.answer_at is not None and self.answer_at < due:
+                due = self.answer_at
+            if self.challenge_deadline is not None and self.challenge_deadline < due:
+                due = self.challenge_deadline
+            if due > timestamp:
+                break
+            self.clock.advance_to(due)
+            if due == self.answer_at:
+                self.answer()
+            elif due == self.challenge_deadline:
+                self.escalate()
+            else:
+                self.tick()
+        self.clock.advance_to(timestamp)
+
+    def feed(self, event):
+        """Feed one (kind, timestamp, x, y, delta) event at the current time"""
+        # Key presses go to the challenge entry while a challenge is up
+        if self.detector.challenge_in_progress and event[0] == KEY_PRESS:
+            return
+        self.detector.feed((event,))
+
+        # New input can change pattern scores: analyse within one interval
+        soon = event[1] + ANALYSIS_INTERVAL
+        if self.next_tick is not None and self.next_tick > soon:
+            self.next_tick = soon
+
+    def tick(self):
+        now = self.clock.now()
+        self.ticks += 1
+        verdict = self.detector.evaluate(now)
+        if verdict.warn:
+            self.warnings += 1
+        if verdict.trigger and self.detector.begin_challenge(now):
+            code_length = self.detector.calculate_challenge_difficulty(verdict.score)
+            self.triggers.append((now, verdict.score, list(verdict.reasons), code_length))
+            self.show_challenge(now, code_length)
+        self.next_tick = self.detector.next_deadline(now)
+
+    def show_challenge(self, now, code_length):
+        self.challenge_start = now
+        self.challenge_deadline = now + CHALLENGE_TIMEOUT
+        delay = self.responder(self, code_length)
+        self.answer_at = now + delay if delay is not None and delay < CHALLENGE_TIMEOUT else None
+
+    def answer(self):
+        now = self.clock.now()
+        stats = self.detector.stats
+        response_time = now - self.challenge_start
+        stats['current_streak'] += 1
+        stats['successful_detections'] += 1
+        stats['longest_streak'] = max(stats['longest_streak'], stats['current_streak'])
+        if stats['avg_response_time'] == 0:
+            stats['avg_response_time'] = response_time
+        else:
+            stats['avg_response_time'] = (stats['avg_response_time'] + response_time) / 2
+        self.answer_at = None
+        self.challenge_deadline = None
+        self.detector.challenge_succeeded(now)
+        self.detector.reset(now)
+        self.next_tick = self.detector.next_deadline(now)
+
+    def escalate(self):
+        now = self.clock.now()
+        self.escalations += 1
+        self.answer_at = None
+        code_length = self.detector.challenge_timed_out()
+        self.detector.challenge_in_progress = True
+        self.show_challenge(now, code_length)
+
+
+def synthetic_activity(duration, rng, start=0.0):
+    """Yield (kind, timestamp, x, y, delta) events for a user switching between states"""
+    t = start
+    x, y = 500, 400
+    end = start + duration
+    while t < end:
+        state = rng.choices(['work', 'browse', 'idle'], weights=[6, 3, 1])[0]
+        state_end = min(end, t + rng.uniform(20, 600))
+        if state == 'idle':
+            t = state_end + rng.uniform(10, 90)
+            continue
+        while t < state_end:
+            if state == 'work':
+                t += rng.expovariate(4.0)   # ~4 keys per second
+                yield (KEY_PRESS, t, x, y, 0)
+                if rng.random() < 0.05:
+                    for _ in range(rng.randint(20, 120)):
+                        t += 0.008
+                        x += rng.randint(-6, 6)
+                        y += rng.randint(-6, 6)
+                        yield (MOUSE_MOVE, t, x, y, 0)
+                    yield (CLICK, t, x, y, 1)
+            else:
+                t += rng.expovariate(2.5)   # Scroll wheel ticks
+                yield (SCROLL, t, x, y, -120)
+                if rng.random() < 0.2:
+                    for _ in range(rng.randint(10, 60)):
+                        t += 0.008
+                        x += rng.randint(-10, 10)
+                        y += rng.randint(-10, 10)
+                        yield (MOUSE_MOVE, t, x, y, 0)
+
+
+def simulate(hours, seed=0, sensitivity='medium', response_time=5.0):
+    """Run a synthetic session of the given length; returns the finished Session"""
+    settings = dict(DEFAULT_SETTINGS, sensitivity=sensitivity)
+    detector = ZombieDetector(settings, dict(DEFAULT_STATS))
+    clock = VirtualClock()
+    session = Session(detector, clock, answer_after(response_time))
+    duration = hours * 3600.0
+
+    for event in synthetic_activity(duration, random.Random(seed)):
+        session.advance_to(event[1])
+        session.feed(event)
+    session.advance_to(duration)
+    return session
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fast-forward a ZombieCheck monitoring session")
+    parser.add_argument('--hours', type=float, default=8.0, help="simulated session length")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sensitivity', default='medium', choices=['low', 'medium', 'high', 'extreme'])
+    parser.add_argument('--response-time', type=float, default=5.0,
+                        help="seconds the simulated user takes to answer (>= 35 times out)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    session = simulate(args.hours, args.seed, args.sensitivity, args.response_time)
+    elapsed = time.perf_counter() - started
+
+    for when, score, reasons, code_length in session.triggers:
+        print(f"{when / 3600:6.2f}h  score {score:5.1f}  code {code_length:2d}  {', '.join(reasons[:3])}")
+    print(f"\n{len(session.triggers)} challenges, {session.escalations} escalations, "
+          f"{session.warnings} warnings over {args.hours:g}h ({session.ticks} ticks) "
+          f"simulated in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
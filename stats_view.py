@@ -0,0 +1,116 @@
+"""View model for the statistics panels
+
+A panel is a list of format strings, one per line, such as
+"Current Streak: {current_streak}". StatsPanel.update(values) compares
+the values each line uses with those of the last update and returns
+(line index, text) patches only for the lines whose text changed, so
+the widget edits a few lines instead of being rebuilt.
+"""
+from functools import lru_cache
+from string import Formatter
+
+
+@lru_cache(maxsize=128)
+def productivity_score(today_interventions, current_streak):
+    return max(0, 100 - (today_interventions * 8) + (current_streak * 3))
+
+
+@lru_cache(maxsize=128)
+def detection_accuracy(successful_detections, total_interventions):
+    if total_interventions <= 0:
+        return 0
+    return (successful_detections / max(1, total_interventions)) * 100
+
+
+def _field_names(template):
+    return tuple(sorted({name for _, name, _, _ in Formatter().parse(template) if name}))
+
+
+class StatsPanel:
+    """Line-oriented view model that reformats only lines whose inputs changed"""
+
+    def __init__(self, templates):
+        self.templates = list(templates)
+        self.fields = [_field_names(template) for template in self.templates]
+        self.inputs = [None] * len(self.templates)
+        self.lines = [None] * len(self.templates)
+
+    def update(self, values):
+        """Return [(index, text)] for the lines that differ from the last update"""
+        patches = []
+        for index, names in enumerate(self.fields):
+            inputs = tuple(values[name] for name in names)
+            if inputs == self.inputs[index]:
+                continue
+            self.inputs[index] = inputs
+            text = self.templates[index].format_map(values) if names else self.templates[index]
+            if text != self.lines[index]:
+                self.lines[index] = text
+                patches.append((index, text))
+        return patches
+
+    def text(self):
+        return "\n".join(line or "" for line in self.lines)
+
+
+PERFORMANCE_LINES = (
+    "📈 Productivity Score: {productivity_score:.0f}/100",
+    "🎯 Interventions Today: {today_interventions}",
+    "✅ Successful Responses: {successful_detections}",
+    "❌ False Positives: {false_positives}",
+    "🛡️ Tolerance Saves: {tolerance_saves}",
+    "⚡ Current Streak: {current_streak}",
+)
+
+LIFETIME_LINES = (
+    "🏆 LIFETIME STATISTICS",
+    "",
+    "Total Interventions: {total_interventions}",
+    "Successful Detections: {successful_detections}",
+    "Detection Accuracy: {accuracy:.1f}%",
+    "False Positive Rate: {false_positives}/{total_interventions}",
+    "",
+    "🔥 STREAKS & RECORDS",
+    "Longest Streak: {longest_streak}",
+    "Current Streak: {current_streak}",
+    "Average Response Time: {avg_response_time:.1f}s",
+    "",
+    "🛡️ TOLERANCE SYSTEM",
+    "Tolerance Saves: {tolerance_saves}",
+    "Current Tolerance: {tolerance_level:.0f}/100",
+    "Grace Period: {grace_status} ({grace_remaining}s remaining)",
+    "Decay Rate: {tolerance_decay:.1f}/sec",
+    "",
+    "⚙️ SYSTEM STATUS",
+    "Monitoring: {monitoring}",
+    "Challenge in Progress: {challenge}",
+    "Sensitivity: {sensitivity}",
+    "Gaming Mode: {gaming_mode}",
+    "Nightmare Mode: {nightmare_mode}",
+    "Adaptive Learning: {adaptive_threshold}",
+)
+
+
+def enabled(flag):
+    return "✅ Enabled" if flag else "❌ Disabled"
+
+
+def stats_values(stats, settings, detector, now, is_active):
+    """Flat field dict for the panels, with derived metrics memoized on their inputs"""
+    in_grace = detector.in_grace_period(now)
+    values = dict(stats)
+    values.update(
+        productivity_score=productivity_score(stats['today_interventions'], stats['current_streak']),
+        accuracy=detection_accuracy(stats['successful_detections'], stats['total_interventions']),
+        tolerance_level=detector.tolerance_level,
+        grace_status="Active" if in_grace else "Inactive",
+        grace_remaining=max(0, int(detector.grace_period_end - now)) if in_grace else 0,
+        tolerance_decay=settings['tolerance_decay'],
+        monitoring="🟢 Active" if is_active else "🔴 Inactive",
+        challenge="🟡 Yes" if detector.challenge_in_progress else "🟢 No",
+        sensitivity=settings['sensitivity'].upper(),
+        gaming_mode=enabled(settings['gaming_mode']),
+        nightmare_mode=enabled(settings['nightmare_mode']),
+        adaptive_threshold=enabled(settings['adaptive_threshold']),
+    )
+    return values
@@ -0,0 +1,242 @@
+import math
+import random
+from collections import deque
+
+import pytest
+
+from activity import (
+    EventRing, MotionCoalescer, RunLengthWindow, SlidingSum, RecentKeyCounter, COLUMNS, KEY_PRESS, CLICK, SCROLL
+)
+from detector import ZombieDetector
+from simulate import DEFAULT_SETTINGS, DEFAULT_STATS
+
+
+def ring_values(ring, column):
+    return [ring.get(column, i) for i in range(len(ring))]
+
+
+def window_values(ring, column, n):
+    return [value for part in ring.window(column, n) for value in part]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_event_ring_matches_bounded_deque(seed):
+    rng = random.Random(seed)
+    capacity = rng.choice((1, 3, 10, 30))
+    ring = EventRing(capacity)
+    reference = deque(maxlen=capacity)
+    t = 0.0
+    for step in range(500):
+        if rng.random() < 0.02:
+            ring.clear()
+            reference.clear()
+            continue
+        t += rng.random()
+        event = (t, rng.randrange(4), rng.randrange(-50, 2000), rng.randrange(-50, 1200),
+                 rng.random() * 100, rng.randrange(-360, 360), rng.random() * 0.05)
+        ring.append(*event)
+        reference.append(event)
+
+        assert len(ring) == len(reference)
+        for index, column in enumerate(('time', 'kind', 'x', 'y', 'distance', 'delta', 'span')):
+            expected = [e[index] for e in reference]
+            if column in ('distance', 'span'):
+                assert ring_values(ring, column) == pytest.approx(expected)
+            else:
+                assert ring_values(ring, column) == expected
+        n = rng.randrange(1, capacity + 2)
+        assert window_values(ring, 'time', n) == [e[0] for e in reference][-n:]
+        back = rng.randrange(len(reference))
+        assert ring.newest('time', back) == reference[-1 - back][0]
+
+
+def test_event_ring_window_wraps_into_two_slices():
+    ring = EventRing(4)
+    for t in range(6):
+        ring.append(float(t))
+    parts = ring.window('time', 4)
+    assert len(parts) == 2
+    assert window_values(ring, 'time', 4) == [2.0, 3.0, 4.0, 5.0]
+    assert window_values(ring, 'time', 2) == [4.0, 5.0]
+    assert ring.get('time', 0) == 2.0 and ring.get('time', -1) == 5.0
+    with pytest.raises(IndexError):
+        ring.get('time', 4)
+
+
+def test_event_ring_append_does_not_allocate_columns():
+    ring = EventRing(8)
+    columns = {name: id(column) for name, column in ring.columns.items()}
+    for t in range(100):
+        ring.append(float(t))
+    assert {name: id(column) for name, column in ring.columns.items()} == columns
+    assert set(ring.columns) == set(COLUMNS)
+
+
+# Original detector scans over the raw history (before the incremental state)
+
+def original_repetitive(kinds):
+    if len(kinds) < 5:
+        return 0
+    recent = kinds[-10:]
+    max_consecutive = 0
+    current_consecutive = 1
+    for i in range(1, len(recent)):
+        if recent[i] == recent[i - 1]:
+            current_consecutive += 1
+        else:
+            max_consecutive = max(max_consecutive, current_consecutive)
+            current_consecutive = 1
+    return min(1.0, max_consecutive / 5.0)
+
+
+def original_rate_check(times, window, minimum):
+    recent = times[-window:]
+    if len(recent) < minimum:
+        return None
+    time_span = recent[-1] - recent[0] if len(recent) > 1 else 1
+    rate = len(recent) / max(time_span, 0.1)
+    gaps = [b - a for a, b in zip(recent, recent[1:])]
+    return rate, sum(gaps) / len(gaps) if gaps else 1
+
+
+def original_rapid_switching(click_times):
+    result = original_rate_check(click_times, 5, 3)
+    if result is None:
+        return 0
+    return min(1.0, max(0, (result[0] - 1) / 2.0))
+
+
+def original_scroll_zombie(scroll_times):
+    result = original_rate_check(scroll_times, 8, 3)
+    if result is None:
+        return 0
+    scroll_rate, avg_gap = result
+    if scroll_rate > 1 and avg_gap < 1:
+        return min(1.0, scroll_rate / 3.0)
+    return 0
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_incremental_checks_match_original_scans(seed):
+    rng = random.Random(seed)
+    detector = ZombieDetector(dict(DEFAULT_SETTINGS), dict(DEFAULT_STATS))
+    kinds, clicks, scrolls = [], [], []
+    t = 0.0
+    for step in range(400):
+        if rng.random() < 0.01:
+            detector.reset(t)
+            kinds, clicks, scrolls = [], [], []
+        t += rng.choice((0.05, 0.2, 0.5, 1.5))
+        # Runs of the same kind are what the repetitive check looks for
+        kind = kinds[-1] if kinds and rng.random() < 0.6 else rng.choice((KEY_PRESS, CLICK, SCROLL))
+        detector.feed([(kind, t, 10, 10, 1)])
+        kinds.append(kind)
+        if kind == CLICK:
+            clicks.append(t)
+        elif kind == SCROLL:
+            scrolls.append(t)
+        kinds, clicks, scrolls = kinds[-100:], clicks[-30:], scrolls[-30:]
+
+        assert detector.check_repetitive_actions() == original_repetitive(kinds)
+        assert detector.check_rapid_switching() == pytest.approx(original_rapid_switching(clicks))
+        assert detector.check_scroll_zombie() == pytest.approx(original_scroll_zombie(scrolls))
+
+
+@pytest.mark.parametrize('size', (1, 3, 10))
+def test_run_length_window_matches_scan(size):
+    rng = random.Random(size)
+    window = RunLengthWindow(size)
+    kinds = []
+    for _ in range(1000):
+        kind = kinds[-1] if kinds and rng.random() < 0.7 else rng.randrange(3)
+        window.push(kind)
+        kinds.append(kind)
+        recent = kinds[-size:]
+        best, run = 0, 1
+        for i in range(1, len(recent)):
+            if recent[i] == recent[i - 1]:
+                run += 1
+            else:
+                best, run = max(best, run), 1
+        assert window.longest() == best
+
+
+def test_sliding_sum_matches_sum_of_window():
+    rng = random.Random(1)
+    sliding = SlidingSum(10)
+    values = []
+    for i in range(SlidingSum.RESYNC_INTERVAL * 2 + 7):
+        value = rng.random() * 1000
+        sliding.push(value)
+        values.append(value)
+        if i % 97 == 0:
+            assert sliding.total == pytest.approx(sum(values[-10:]), rel=1e-9)
+    assert sliding.total == pytest.approx(sum(values[-10:]), rel=1e-12)
+    sliding.clear()
+    assert sliding.total == 0 and sliding.count == 0
+
+
+def test_recent_key_counter_matches_buffer_scan():
+    rng = random.Random(2)
+    buffer_size = 20
+    counter = RecentKeyCounter(buffer_size)
+    activity = []   # (time, is_key)
+    cutoff = 0.0
+    t = 0.0
+    for position in range(2000):
+        t += rng.random()
+        is_key = rng.random() < 0.3
+        if is_key:
+            counter.push(t, position)
+        activity.append((t, is_key))
+        cutoff = max(cutoff, t - rng.random() * 15)    # Cutoffs never decrease
+        expected = sum(1 for time, key in activity[-buffer_size:] if key and time > cutoff)
+        assert counter.count_after(cutoff, position + 1) == expected
+
+
+@pytest.mark.parametrize('rate', (60, 125, 1000))
+def test_coalesced_motion_window_matches_raw_samples(rate):
+    """Aggregates cover exactly the path and span of the raw samples they hold"""
+    rng = random.Random(rate)
+    detector = ZombieDetector(dict(DEFAULT_SETTINGS), dict(DEFAULT_STATS))
+    interval = detector.motion.interval
+    raw = []    # (time, step from the previous sample)
+    x = y = 0
+    t = 0.0
+    for _ in range(3000):
+        t += (0.5 + rng.random()) / rate
+        nx, ny = x + rng.randrange(-30, 31), y + rng.randrange(-30, 31)
+        raw.append((t, math.hypot(nx - x, ny - y)))
+        x, y = nx, ny
+        detector.on_motion(t, x, y)
+
+        moves = detector.mouse_movements
+        if not len(moves):
+            continue
+        window = min(10, len(moves))
+        first_time = moves.newest('time', window - 1) - moves.newest('span', window - 1)
+        last_time = moves.newest('time')
+        # (first_time is end - span, so allow for rounding at the window start)
+        covered = [step for time, step in raw if first_time - 1e-9 <= time <= last_time]
+        assert detector.recent_distance.total == pytest.approx(sum(covered))
+        assert moves.newest('delta', 0) >= 1     # Samples in the newest aggregate
+
+    # Each aggregate spans at least one interval, and less than one interval plus a sample gap
+    max_gap = 1.5 / rate
+    spans = [detector.mouse_movements.get('span', i) for i in range(len(detector.mouse_movements))]
+    assert all(interval <= span < interval + max_gap for span in spans)
+
+
+def test_coalescer_tracks_bounding_box_and_displacement():
+    coalescer = MotionCoalescer(interval=0.75)
+    coalescer.x, coalescer.y = 100, 100
+    coalescer.clear()
+    for t, (x, y) in enumerate(((110, 90), (130, 120), (90, 100), (103, 104))):
+        full = coalescer.add(t * 0.25, x, y)
+    assert full
+    assert coalescer.samples == 4
+    assert coalescer.bounding_box() == (90, 90, 130, 120)
+    assert coalescer.displacement() == pytest.approx(5.0)
+    assert coalescer.path == pytest.approx(
+        math.hypot(10, 10) + math.hypot(20, 30) + math.hypot(40, 20) + math.hypot(13, 4))
+    assert coalescer.end_time - coalescer.start_time == 0.75
@@ -0,0 +1,98 @@
+import sys
+import time
+
+import audio
+from audio import AudioWorker, NullBackend, PipeBackend, render_tone, ALARM_FREQUENCY, SAMPLE_RATE
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_alarm_repeats_until_stopped(monkeypatch):
+    monkeypatch.setattr(audio, 'ALARM_GAP', 0.01)
+    backend = NullBackend()
+    worker = AudioWorker(backend)
+
+    worker.start_alarm()
+    worker.start_alarm()    # Already beeping: no second alarm
+    assert wait_for(lambda: backend.plays >= 3)
+
+    worker.stop()
+    assert wait_for(lambda: not worker.alarming)
+    plays = backend.plays
+    time.sleep(0.05)
+    assert backend.plays == plays
+
+    worker.close()
+    worker.thread.join(timeout=1)
+    assert not worker.thread.is_alive()
+
+
+# Stand-in for aplay: copies raw PCM from stdin to a file as it arrives
+RECORDER = """
+import os, sys
+with open(sys.argv[1], 'ab', buffering=0) as out:
+    while True:
+        chunk = os.read(0, 65536)
+        if not chunk:
+            break
+        out.write(chunk)
+"""
+
+
+def test_pipe_backend_keeps_one_player_for_the_alarm(tmp_path):
+    path = tmp_path / 'played.raw'
+    tone = render_tone(ALARM_FREQUENCY, 0.01)
+    backend = PipeBackend([sys.executable, '-c', RECORDER, str(path)], gap=0.02)
+    silence = bytes(2 * int(0.02 * SAMPLE_RATE))
+
+    backend.play(tone)
+    process = backend.process
+    backend.play(tone)
+    assert backend.process is process
+    expected = (tone + silence) * 2
+    assert wait_for(lambda: path.exists() and path.stat().st_size == len(expected))
+    assert path.read_bytes() == expected
+
+    backend.interrupt()
+    assert backend.process is None
+    assert process.returncode is not None
+
+    # The next alarm gets a fresh player
+    backend.play(tone)
+    assert backend.process is not process
+    backend.close()
+    assert backend.process is None
+
+
+def test_pipe_backend_replaces_a_player_that_exited(tmp_path):
+    backend = PipeBackend([sys.executable, '-c', 'pass'], gap=0.0)
+    tone = bytes(1 << 20)  # More than a pipe buffer, so the write sees the reader gone
+    backend.play(tone)
+    assert backend.process is None
+    backend.play(tone)
+    backend.close()
+
+
+def test_stop_cuts_off_a_player_that_is_behind(monkeypatch):
+    monkeypatch.setattr(audio, 'ALARM_GAP', 0.01)
+    # A player that never reads: the worker blocks on a full pipe mid-alarm
+    backend = PipeBackend([sys.executable, '-c', 'import time; time.sleep(30)'], gap=2.0)
+    worker = AudioWorker(backend)
+    worker.start_alarm()
+    assert wait_for(lambda: backend.process is not None)
+    process = backend.process
+    time.sleep(0.1)
+
+    worker.stop()
+    assert process.returncode is not None
+    assert wait_for(lambda: not worker.alarming)
+    worker.close()
+    worker.thread.join(timeout=1)
+    assert not worker.thread.is_alive()
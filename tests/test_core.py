@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+from core import TkAsyncBridge
+
+
+class FakeTk:
+    def createfilehandler(self, fd, mask, callback):
+        self.handler = callback
+
+    def deletefilehandler(self, fd):
+        self.handler = None
+
+
+class FakeRoot:
+    """Records after() jobs; run_until() fires them in due order in real time"""
+
+    def __init__(self):
+        self.tk = FakeTk()
+        self.jobs = {}
+        self.next_id = 0
+        self.fired = []
+
+    def after(self, delay_ms, callback):
+        self.next_id += 1
+        self.jobs[self.next_id] = (time.monotonic() + delay_ms / 1000, delay_ms, callback)
+        return self.next_id
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_until(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and self.jobs and time.monotonic() < deadline:
+            job = min(self.jobs, key=lambda job: self.jobs[job][0])
+            due, delay_ms, callback = self.jobs.pop(job)
+            time.sleep(max(0.0, due - time.monotonic()))
+            self.fired.append(delay_ms)
+            callback()
+        return condition()
+
+
+def test_sleeping_task_wakes_at_its_deadline():
+    root = FakeRoot()
+    bridge = TkAsyncBridge(root)
+    woke = []
+
+    async def nap():
+        started = bridge.loop.time()
+        await asyncio.sleep(0.05)
+        woke.append(bridge.loop.time() - started)
+
+    try:
+        bridge.spawn(nap())
+        assert root.run_until(lambda: woke)
+        assert woke[0] >= 0.05
+        # Start, one pump at the deadline, one to resume the task: no polling in between
+        assert len(root.fired) <= 4
+        assert any(delay_ms >= 50 for delay_ms in root.fired)
+        # The task's done callbacks take one more pump, after which nothing is armed
+        assert root.run_until(lambda: not root.jobs)
+    finally:
+        bridge.close()
+
+
+def test_wait_for_times_out_and_tk_side_set_resumes():
+    root = FakeRoot()
+    bridge = TkAsyncBridge(root)
+    event = asyncio.Event()
+    results = []
+
+    async def waiter():
+        for _ in range(2):
+            try:
+                await asyncio.wait_for(event.wait(), 0.03)
+                results.append('set')
+            except asyncio.TimeoutError:
+                results.append('timeout')
+                root.after(0, event.set)    # A Tk callback wakes the next wait
+
+    try:
+        bridge.spawn(waiter())
+        assert root.run_until(lambda: len(results) == 2)
+        assert results == ['timeout', 'set']
+    finally:
+        bridge.close()
+
+
+def test_cancelled_timer_does_not_keep_the_bridge_armed():
+    root = FakeRoot()
+    bridge = TkAsyncBridge(root)
+    try:
+        handle = bridge.loop.call_later(10.0, lambda: None)
+        bridge.pump()
+        assert [round(job[1], -2) for job in root.jobs.values()] == [10000]
+        handle.cancel()
+        bridge.pump()
+        assert not root.jobs
+    finally:
+        bridge.close()
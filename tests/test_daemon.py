@@ -0,0 +1,80 @@
+import pytest
+
+from activity import CLICK
+from daemon import SharedRing, DetectorProxy, apply_command, ACTIVITY, VERDICT, TRIGGER
+from detector import ZombieDetector
+from simulate import DEFAULT_SETTINGS, DEFAULT_STATS
+
+
+class LoopbackDaemon:
+    """Stands in for DetectorDaemon: commands are applied to an in-process detector"""
+
+    def __init__(self, detector):
+        self.detector = detector
+
+    def send(self, *command):
+        apply_command(self.detector, command)
+
+
+def make_pair():
+    daemon_detector = ZombieDetector(dict(DEFAULT_SETTINGS), dict(DEFAULT_STATS))
+    gui_detector = ZombieDetector(dict(DEFAULT_SETTINGS), dict(DEFAULT_STATS))
+    return daemon_detector, DetectorProxy(gui_detector, LoopbackDaemon(daemon_detector))
+
+
+def trigger(ring, daemon_detector, now):
+    """What run_daemon does on a triggering tick"""
+    daemon_detector.begin_challenge(now)
+    ring.write(VERDICT, TRIGGER, daemon_detector.zombie_incidents, now, 100.0, daemon_detector.tolerance_level)
+
+
+def test_one_daemon_trigger_is_one_incident_on_both_sides():
+    ring = SharedRing(slots=8)
+    try:
+        daemon_detector, proxy = make_pair()
+        trigger(ring, daemon_detector, 10.0)
+        for record in ring.read():
+            proxy.mirror(record)
+        assert proxy.accept_challenge(10.0)
+        assert proxy.zombie_incidents == daemon_detector.zombie_incidents == 1
+
+        proxy.challenge_succeeded(15.0)
+        assert not daemon_detector.challenge_in_progress
+        assert daemon_detector.grace_period_end == proxy.grace_period_end
+        assert proxy.zombie_incidents == daemon_detector.zombie_incidents == 1
+    finally:
+        ring.close()
+
+
+def test_released_challenge_is_not_an_incident():
+    ring = SharedRing(slots=8)
+    try:
+        daemon_detector, proxy = make_pair()
+        trigger(ring, daemon_detector, 10.0)
+        for record in ring.read():
+            proxy.mirror(record)
+        proxy.release_daemon()     # GUI stopped monitoring meanwhile
+        assert not daemon_detector.challenge_in_progress
+        assert proxy.zombie_incidents == daemon_detector.zombie_incidents == 0
+    finally:
+        ring.close()
+
+
+def test_ring_round_trip():
+    ring = SharedRing(slots=4)
+    reader = SharedRing(ring.name, 4)
+    try:
+        ring.write(ACTIVITY, CLICK, events=3, timestamp=12.5)
+        ring.write(VERDICT, TRIGGER, 2, 13.0, 80.0, 25.0, 0.001, reasons=("Aimless mouse movement", "Idle"))
+        activity, verdict = reader.read()
+        assert (activity.kind, activity.flags, activity.events, activity.timestamp) == (ACTIVITY, CLICK, 3, 12.5)
+        assert verdict.duration == pytest.approx(0.001)
+        assert verdict.reasons == ["Aimless mouse movement", "Idle"]
+
+        for i in range(6):
+            ring.write(ACTIVITY, events=i)
+        assert [record.events for record in reader.read()] == [2, 3, 4, 5]
+        assert reader.lost == 2
+    finally:
+        reader.close()
+        ring.close()
@@ -0,0 +1,62 @@
+import os
+
+from activity import CLICK
+from decisions import DecisionTrace, DecisionDumper, read_decisions, IDLE_ALARM, PAUSED, TRIGGER
+from detector import ZombieDetector
+from simulate import DEFAULT_SETTINGS, DEFAULT_STATS
+
+
+def make_detector():
+    detector = ZombieDetector(dict(DEFAULT_SETTINGS), dict(DEFAULT_STATS))
+    detector.trace = DecisionTrace(capacity=8)
+    return detector
+
+
+def rapid_clicks(detector, start):
+    detector.feed([(CLICK, start + i * 0.1, 10, 10, 1) for i in range(8)])
+
+
+def test_early_returns_do_not_record_stale_tick_state():
+    detector = make_detector()
+    rapid_clicks(detector, 100.0)
+    detector.evaluate(101.0)
+    assert detector.pattern_score > 0
+
+    # Idle alarm: the pattern checks do not run
+    detector.evaluate(101.0 + 200)
+    # Paused: nothing runs
+    detector.begin_challenge(301.5)
+    detector.evaluate(302.0)
+
+    columns = detector.trace.snapshot()
+    assert list(columns['flags'][1:]) == [IDLE_ALARM | TRIGGER, PAUSED]
+    assert columns['pattern_score'][0] > 0
+    assert list(columns['pattern_score'][1:]) == [0, 0]
+    assert list(columns['switching'][1:]) == [0, 0]
+    assert columns['idle'][1] >= 199
+    assert columns['idle'][2] == 0
+    assert columns['threshold'][2] == 0
+
+
+def test_dump_round_trip_after_wrapping(tmp_path):
+    detector = make_detector()
+    for i in range(11):
+        detector.last_activity = 100.0 + i
+        detector.evaluate(100.0 + i)
+    path = str(tmp_path / 'trace.zdt')
+    detector.trace.dump(path)
+    columns = read_decisions(path)
+    assert list(columns['time']) == [100.0 + i for i in range(3, 11)]
+
+
+def test_dumper_writes_off_the_calling_thread(tmp_path):
+    detector = make_detector()
+    detector.evaluate(1.0)
+    directory = str(tmp_path / 'dumps')
+    dumper = DecisionDumper(directory)
+    dumper.dump(detector.trace, 'challenge')
+    detector.evaluate(2.0)     # Not part of the dump already taken
+    dumper.close()
+    [name] = os.listdir(directory)
+    assert name.endswith('-challenge.zdt')
+    assert list(read_decisions(os.path.join(directory, name))['time']) == [1.0]
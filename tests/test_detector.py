@@ -0,0 +1,29 @@
+from detector import ZombieDetector, ANALYSIS_INTERVAL
+from simulate import DEFAULT_SETTINGS, DEFAULT_STATS
+
+
+def make_detector():
+    return ZombieDetector(dict(DEFAULT_SETTINGS), dict(DEFAULT_STATS))
+
+
+def test_grace_period_costs_no_tolerance():
+    detector = make_detector()
+    detector.tolerance_level = 60
+    detector.reset(100.0)
+    assert detector.begin_challenge(100.0)
+    detector.challenge_succeeded(105.0)
+    tolerance = detector.tolerance_level
+
+    # The scheduler runs no ticks during grace; the first comes at its end
+    grace_end = detector.next_deadline(105.0)
+    assert grace_end == 105.0 + DEFAULT_SETTINGS['grace_period']
+    detector.last_activity = grace_end
+    verdict = detector.evaluate(grace_end)
+
+    assert not verdict.trigger
+    assert detector.tolerance_level == tolerance
+
+    # Decay resumes from the end of grace
+    detector.last_activity = grace_end + ANALYSIS_INTERVAL
+    detector.evaluate(grace_end + ANALYSIS_INTERVAL)
+    assert detector.tolerance_level == tolerance - DEFAULT_SETTINGS['tolerance_decay']
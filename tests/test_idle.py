@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from clock import VirtualClock
+from detector import ZombieDetector
+from idle import EventIdleProvider, XScreenSaverIdleProvider, open_idle_provider
+from simulate import DEFAULT_SETTINGS, DEFAULT_STATS
+
+
+def test_event_idle_provider_uses_last_activity():
+    detector = ZombieDetector(dict(DEFAULT_SETTINGS), dict(DEFAULT_STATS))
+    detector.last_activity = 90.0
+    provider = EventIdleProvider(detector)
+    assert provider.idle_seconds(100.0) == 10.0
+
+
+def test_observe_idle_only_moves_last_activity_forward():
+    detector = ZombieDetector(dict(DEFAULT_SETTINGS), dict(DEFAULT_STATS))
+    detector.last_activity = 90.0
+    detector.observe_idle(100.0, 4.0)
+    assert detector.last_activity == 96.0
+    detector.observe_idle(100.0, 30.0)
+    assert detector.last_activity == 96.0
+
+
+def test_auto_without_display_uses_events(monkeypatch):
+    monkeypatch.delenv('DISPLAY', raising=False)
+    detector = ZombieDetector(dict(DEFAULT_SETTINGS), dict(DEFAULT_STATS))
+    assert open_idle_provider('auto', detector).name == 'events'
+
+
+def test_xss_reports_server_idle_time():
+    if not os.environ.get('DISPLAY'):
+        pytest.skip("no X display (run under Xvfb)")
+    try:
+        provider = XScreenSaverIdleProvider()
+    except OSError as e:
+        pytest.skip(str(e))
+    try:
+        clock = VirtualClock()
+        first = provider.idle_seconds(clock.now())
+        assert first >= 0
+        assert provider.idle_seconds(clock.now()) >= first
+    finally:
+        provider.close()
@@ -0,0 +1,139 @@
+import os
+import select
+import time
+
+import pytest
+
+from activity import MOUSE_MOVE, KEY_PRESS, CLICK, SCROLL
+from clock import VirtualClock
+from input_sources import (
+    ThreadedInputSource, EvdevInputSource, X11RecordInputSource, INPUT_EVENT, BATCH_INTERVAL, WHEEL_DELTA,
+    EV_SYN, EV_KEY, EV_REL, SYN_REPORT, REL_X, REL_Y, REL_WHEEL
+)
+
+KEY_A, BTN_LEFT = 30, 0x110
+
+
+def input_events(*events):
+    return b''.join(INPUT_EVENT.pack(0, 0, kind, code, value) for kind, code, value in events)
+
+
+def wait_readable(fd, timeout=1.0):
+    readable, _, _ = select.select([fd], [], [], timeout)
+    return bool(readable)
+
+
+@pytest.fixture
+def fake_device(tmp_path):
+    """A FIFO standing in for /dev/input/eventN; yields (path, writer fd)"""
+    path = str(tmp_path / 'event0')
+    os.mkfifo(path)
+    holder = {}
+    yield path, holder
+    if 'fd' in holder:
+        os.close(holder['fd'])
+
+
+def test_evdev_events_arrive_in_one_batch(fake_device):
+    path, holder = fake_device
+    source = EvdevInputSource(None, VirtualClock(5.0), [path])
+    holder['fd'] = os.open(path, os.O_WRONLY)
+    source.start_reader()
+    try:
+        os.write(holder['fd'], input_events(
+            (EV_REL, REL_X, 5), (EV_REL, REL_Y, 3), (EV_SYN, SYN_REPORT, 0),
+            (EV_KEY, KEY_A, 1), (EV_KEY, KEY_A, 2), (EV_KEY, KEY_A, 0),    # Press, autorepeat, release
+            (EV_KEY, BTN_LEFT, 1), (EV_KEY, BTN_LEFT, 0),
+            (EV_REL, REL_WHEEL, -1), (EV_SYN, SYN_REPORT, 0),
+        ))
+        assert wait_readable(source.queue.read_fd)
+        assert len(source.queue.batches) == 1
+        assert source.queue.drain() == [
+            (MOUSE_MOVE, 5.0, 5, 3, 0),
+            (KEY_PRESS, 5.0, 0, 0, 0),
+            (CLICK, 5.0, 5, 3, 1),
+            (SCROLL, 5.0, 0, 0, -WHEEL_DELTA),
+        ]
+    finally:
+        source.stop()
+
+
+def test_evdev_holds_events_for_a_batch_interval(fake_device):
+    path, holder = fake_device
+    source = EvdevInputSource(None, VirtualClock(), [path])
+    holder['fd'] = os.open(path, os.O_WRONLY)
+    source.start_reader()
+    try:
+        started = time.monotonic()
+        for _ in range(5):
+            os.write(holder['fd'], input_events((EV_KEY, KEY_A, 1)))
+        assert wait_readable(source.queue.read_fd)
+        assert time.monotonic() - started >= BATCH_INTERVAL * 0.9
+        assert len(source.queue.drain()) == 5
+    finally:
+        source.stop()
+
+
+def test_evdev_closes_unplugged_device(fake_device):
+    path, holder = fake_device
+    source = EvdevInputSource(None, VirtualClock(), [path])
+    fd = source.fds[0]
+    holder['fd'] = os.open(path, os.O_WRONLY)
+    source.start_reader()
+    try:
+        os.close(holder.pop('fd'))   # Reader sees end of file, as for a removed device
+        deadline = time.monotonic() + 1
+        while source.fds and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert source.fds == []
+        with pytest.raises(OSError):
+            os.fstat(fd)
+    finally:
+        source.stop()
+
+
+def x11_display():
+    pytest.importorskip('Xlib')
+    if not os.environ.get('DISPLAY'):
+        pytest.skip("no X display (run under Xvfb)")
+    from Xlib import display
+    return display.Display()
+
+
+def test_x11_record_batches_injected_events():
+    injector = x11_display()
+    from Xlib import X
+    from Xlib.ext import xtest
+    if not injector.has_extension('XTEST'):
+        pytest.skip("X server has no XTEST extension")
+    try:
+        source = X11RecordInputSource(None, VirtualClock(7.0))
+    except OSError as e:
+        pytest.skip(str(e))
+    source.start_reader()
+    try:
+        time.sleep(0.1)     # Let the RECORD context come up
+        for x in range(10, 60, 10):
+            xtest.fake_input(injector, X.MotionNotify, x=x, y=20)
+        keycode = injector.keysym_to_keycode(ord('a'))
+        xtest.fake_input(injector, X.KeyPress, keycode)
+        xtest.fake_input(injector, X.KeyRelease, keycode)
+        injector.sync()
+
+        events = []
+        deadline = time.monotonic() + 2
+        while len(events) < 6 and time.monotonic() < deadline:
+            if wait_readable(source.queue.read_fd, 0.1):
+                batches = len(source.queue.batches)
+                events.extend(source.queue.drain())
+                assert batches < 6      # Coalesced, not one batch per event
+        assert [event[0] for event in events] == [MOUSE_MOVE] * 5 + [KEY_PRESS]
+        assert events[4][2:4] == (50, 20)
+    finally:
+        source.stop()
+        injector.close()
+
+
+def test_threaded_source_requires_read_loop():
+    with pytest.raises(TypeError):
+        ThreadedInputSource(None, VirtualClock())
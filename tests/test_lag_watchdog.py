@@ -0,0 +1,60 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from lag_watchdog import LagWatchdog
+from timers import TimerService
+
+
+@pytest.fixture
+def timers():
+    loop = asyncio.new_event_loop()
+    service = TimerService(SimpleNamespace(loop=loop, poke=lambda: None, tasks=set()))
+    yield service
+    loop.close()
+
+
+def run_loop(loop, seconds):
+    loop.run_until_complete(asyncio.sleep(seconds))
+
+
+def test_stall_is_reported_once(timers):
+    watchdog = LagWatchdog(timers, threshold=0.1)
+    watchdog.start()
+    try:
+        fired = []
+        timers.schedule('render', 0.01, fired.append, 1)
+        time.sleep(0.4)     # The Tk thread is stuck: the timer cannot fire
+        run_loop(timers.loop, 0.01)
+        assert fired == [1]
+        assert len(watchdog.stalls) == 1
+        assert watchdog.stalls[0].lag >= 0.1
+        assert 'test_stall_is_reported_once' in watchdog.stalls[0].stack
+        assert watchdog.worst_lag >= 0.3
+    finally:
+        watchdog.stop()
+
+
+def test_idle_watchdog_does_not_wake(timers):
+    watchdog = LagWatchdog(timers, threshold=0.05)
+    checks = []
+    earliest_due = watchdog.earliest_due
+    watchdog.earliest_due = lambda: checks.append(1) or earliest_due()
+    watchdog.start()
+    try:
+        time.sleep(0.3)
+        assert len(checks) == 1     # Asleep until a timer is scheduled
+        assert timers.handles == {}
+
+        timers.schedule('toast', 0.02, lambda: None)
+        run_loop(timers.loop, 0.05)
+        time.sleep(0.1)
+        woken = len(checks)
+        assert woken > 1
+        time.sleep(0.3)
+        assert len(checks) == woken
+        assert not watchdog.stalls
+    finally:
+        watchdog.stop()
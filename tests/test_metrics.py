@@ -0,0 +1,42 @@
+import urllib.request
+
+from metrics import Registry, MetricsServer, AppMetrics, CONTENT_TYPE
+
+
+def test_counter_is_typed_under_its_sample_name():
+    registry = Registry()
+    registry.counter('input_events', "Input events handled, by type", ['kind']).labels('click').inc(3)
+    assert registry.expose().splitlines() == [
+        "# HELP zombiecheck_input_events_total Input events handled, by type",
+        "# TYPE zombiecheck_input_events_total counter",
+        'zombiecheck_input_events_total{kind="click"} 3',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    histogram = registry.histogram('tick_seconds', "Tick time", bounds=(0.001, 0.01)).labels()
+    for value in (0.0005, 0.005, 0.005, 1.0):
+        histogram.observe(value)
+    lines = registry.expose().splitlines()
+    assert lines[1] == "# TYPE zombiecheck_tick_seconds histogram"
+    assert lines[2:] == [
+        'zombiecheck_tick_seconds_bucket{le="0.001"} 1',
+        'zombiecheck_tick_seconds_bucket{le="0.01"} 3',
+        'zombiecheck_tick_seconds_bucket{le="+Inf"} 4',
+        'zombiecheck_tick_seconds_sum 1.0105',
+        'zombiecheck_tick_seconds_count 4',
+    ]
+
+
+def test_server_exposes_app_metrics():
+    metrics = AppMetrics()
+    metrics.count_events([(0, 1.0, 0, 0, 0), (0, 1.1, 0, 0, 0)])
+    server = MetricsServer(metrics.registry, 0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+            assert response.headers['Content-Type'] == CONTENT_TYPE
+            body = response.read().decode()
+        assert 'zombiecheck_input_events_total{kind="mouse_move"} 2' in body
+    finally:
+        server.close()
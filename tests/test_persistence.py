@@ -0,0 +1,312 @@
+import calendar
+import json
+import os
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import app
+from detector import ZombieDetector
+from metrics import AppMetrics
+from persistence import StatsJournal, InterventionHistory, bucket_starts, rollup_increments, _local_buckets
+from simulate import DEFAULT_SETTINGS, DEFAULT_STATS
+
+
+def write_lines(path, records, tail=''):
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+        f.write(tail)
+
+
+def load_into_app(journal):
+    """ZombieCheck.load_stats run on a bare app holding only what it touches"""
+    settings = dict(DEFAULT_SETTINGS)
+    stats = dict(DEFAULT_STATS)
+    gui = SimpleNamespace(journal=journal, stats=stats, settings=settings,
+                          detector=ZombieDetector(settings, stats), metrics=AppMetrics())
+    gui.roll_over_day = lambda: app.ZombieCheck.roll_over_day(gui)
+    app.ZombieCheck.load_stats(gui)
+    return gui
+
+
+def test_torn_final_line_is_dropped_and_truncated(tmp_path):
+    snapshot = str(tmp_path / 'zombie_stats.json')
+    journal_path = str(tmp_path / 'zombie_stats.journal')
+    records = [
+        {'stats': {'total_interventions': 1}, 'seq': 1},
+        {'stats': {'total_interventions': 2}, 'tolerance_level': 12, 'seq': 2},
+    ]
+    write_lines(journal_path, records, tail='{"stats":{"total_interventions":3},"se')
+    intact = sum(len(json.dumps(record)) + 1 for record in records)
+
+    gui = load_into_app(StatsJournal(snapshot))
+    assert gui.stats['total_interventions'] == 2
+    assert gui.detector.tolerance_level == 12
+    assert os.path.getsize(journal_path) == intact
+
+    # Appends continue after the last intact record
+    gui.stats['total_interventions'] = 3
+    app.ZombieCheck.save_stats(gui)
+    gui.journal.close()
+    assert load_into_app(StatsJournal(snapshot)).stats['total_interventions'] == 3
+
+
+def test_corrupt_line_ends_replay(tmp_path):
+    snapshot = str(tmp_path / 'zombie_stats.json')
+    journal_path = str(tmp_path / 'zombie_stats.journal')
+    write_lines(journal_path, [{'stats': {'current_streak': 4}, 'seq': 1}],
+                tail='not json\n' + json.dumps({'stats': {'current_streak': 9}, 'seq': 2}) + '\n')
+
+    state = StatsJournal(snapshot).recover()
+    assert state['stats'] == {'current_streak': 4}
+    assert state['seq'] == 1
+    with open(journal_path) as f:
+        assert f.read().count('\n') == 1
+
+
+def test_records_covered_by_snapshot_are_not_replayed(tmp_path):
+    # Crash after os.replace(snapshot) but before the journal was truncated
+    snapshot = str(tmp_path / 'zombie_stats.json')
+    journal_path = str(tmp_path / 'zombie_stats.journal')
+    with open(snapshot, 'w') as f:
+        json.dump({'stats': {'total_interventions': 30, 'false_positives': 3}, 'seq': 3}, f)
+    write_lines(journal_path, [
+        {'stats': {'total_interventions': 10, 'false_positives': 1}, 'seq': 1},
+        {'stats': {'total_interventions': 20}, 'seq': 2},
+        {'stats': {'total_interventions': 30, 'false_positives': 3}, 'seq': 3},
+        {'stats': {'total_interventions': 31}, 'seq': 4},
+    ])
+
+    journal = StatsJournal(snapshot)
+    gui = load_into_app(journal)
+    assert gui.stats['total_interventions'] == 31
+    assert gui.stats['false_positives'] == 3
+    assert journal.seq == 4
+
+
+def test_journal_compacts_every_500_records(tmp_path):
+    snapshot = str(tmp_path / 'zombie_stats.json')
+    journal = StatsJournal(snapshot)
+    journal.recover()
+
+    # Drive the writer-thread sink directly so compaction timing is deterministic
+    journal.write([{'stats': {'total_interventions': seq}, 'seq': seq} for seq in range(1, 500)])
+    journal.sync()
+    assert not os.path.exists(snapshot)
+    with open(journal.journal_path) as f:
+        assert len(f.readlines()) == 499
+
+    journal.write([{'stats': {'total_interventions': 500}, 'seq': 500}])
+    journal.sync()
+    journal.finish()
+    assert os.path.getsize(journal.journal_path) == 0
+    assert not os.path.exists(snapshot + '.tmp')
+    with open(snapshot) as f:
+        data = json.load(f)
+    assert data['seq'] == 500
+    assert data['stats'] == {'total_interventions': 500}
+
+
+def test_close_fsyncs_journal_and_snapshot(tmp_path, monkeypatch):
+    synced = []
+    fsync = os.fsync
+
+    def recording_fsync(fd):
+        synced.append(os.fstat(fd).st_ino)
+        fsync(fd)
+
+    monkeypatch.setattr(os, 'fsync', recording_fsync)
+    snapshot = str(tmp_path / 'zombie_stats.json')
+    journal = StatsJournal(snapshot, sync_interval=60.0)
+    journal.recover()
+    assert journal.record({'total_interventions': 5}, {'gaming_mode': True}, 25)
+    assert not journal.record({'total_interventions': 5}, {'gaming_mode': True}, 25)
+    journal.close()
+
+    assert os.stat(journal.journal_path).st_ino in synced
+    assert os.stat(snapshot).st_ino in synced
+    state = StatsJournal(snapshot).recover()
+    assert state['stats'] == {'total_interventions': 5}
+    assert state['settings'] == {'gaming_mode': True}
+    assert state['tolerance_level'] == 25
+    assert state['seq'] == 1
+
+
+def test_history_rows_survive_writer_close(tmp_path):
+    path = str(tmp_path / 'zombie_history.db')
+    history = InterventionHistory(path, sync_interval=60.0)
+    history.record('triggered', score=80.0, reasons=('rapid clicking', 'scroll zombie'), timestamp=1000.0)
+    history.record('success', code_length=6, response_time=7.5, timestamp=1010.0)
+    history.record('false_positive', timestamp=5000.0)
+    history.close()
+
+    reopened = InterventionHistory(path)
+    try:
+        assert reopened.query('PRAGMA journal_mode') == [('wal',)]
+        assert reopened.query('SELECT timestamp, outcome, score, code_length, response_time, reasons '
+                              'FROM interventions ORDER BY id') == [
+            (1000.0, 'triggered', 80.0, None, None, 'rapid clicking, scroll zombie'),
+            (1010.0, 'success', None, 6, 7.5, None),
+            (5000.0, 'false_positive', None, None, None, None),
+        ]
+        assert reopened.outcome_counts(0, 2000) == {'triggered': 1, 'success': 1}
+        assert reopened.interventions_per_hour(0) == [(0, 1)]
+        assert reopened.average_response_time(0) == 7.5
+    finally:
+        reopened.close()
+
+
+def test_history_appends_across_writer_sessions(tmp_path):
+    history = InterventionHistory(str(tmp_path / 'zombie_history.db'), sync_interval=0.0)
+    history.record('timeout', timestamp=100.0)
+    history.close()
+    assert history.outcome_counts(0) == {'timeout': 1}
+
+    # record() after close() starts a fresh writer on the same database
+    history.record('timeout', timestamp=200.0)
+    history.close()
+    assert history.outcome_counts(0) == {'timeout': 2}
+    history.close()
+
+
+def test_history_rejects_unknown_outcome(tmp_path):
+    history = InterventionHistory(str(tmp_path / 'zombie_history.db'))
+    with pytest.raises(ValueError):
+        history.record('dismissed')
+    assert history.writer is None
+
+
+def utc(*fields):
+    return float(calendar.timegm(fields + (0,) * (6 - len(fields))))
+
+
+@pytest.fixture
+def local_zone(monkeypatch):
+    """Switch the process time zone (POSIX TZ string) for one test"""
+    def switch(zone):
+        monkeypatch.setenv('TZ', zone)
+        time.tzset()
+        _local_buckets.cache_clear()
+    yield switch
+    monkeypatch.undo()
+    time.tzset()
+    _local_buckets.cache_clear()
+
+
+def test_minute_buckets_start_on_the_boundary(local_zone):
+    local_zone('UTC0')
+    start = utc(2024, 1, 1, 12, 30)
+    assert bucket_starts(start) == (start, utc(2024, 1, 1, 12), utc(2024, 1, 1))
+    assert bucket_starts(start - 0.001)[0] == start - 60
+    assert bucket_starts(start + 59.999)[0] == start
+
+
+def test_hour_buckets_follow_local_half_hour_offsets(local_zone):
+    local_zone('IST-5:30')
+    # 16:15 in UTC+5:30 is 10:45 UTC
+    assert bucket_starts(utc(2024, 1, 1, 10, 45)) == (
+        utc(2024, 1, 1, 10, 45), utc(2024, 1, 1, 10, 30), utc(2023, 12, 31, 18, 30))
+
+
+def test_local_days_across_dst_transitions(local_zone):
+    local_zone('EST5EDT,M3.2.0,M11.1.0')
+    # 2024-03-10 springs forward at 02:00 EST (07:00 UTC): a 23-hour day
+    day = utc(2024, 3, 10, 5)
+    next_day = utc(2024, 3, 11, 4)
+    assert bucket_starts(utc(2024, 3, 10, 6, 59))[1:] == (utc(2024, 3, 10, 6), day)
+    assert bucket_starts(utc(2024, 3, 10, 7))[1:] == (utc(2024, 3, 10, 7), day)
+    assert bucket_starts(next_day - 1)[2] == day
+    assert bucket_starts(next_day)[2] == next_day
+
+    # 2024-11-03 falls back at 02:00 EDT (06:00 UTC): 01:00 local happens twice, a 25-hour day
+    day = utc(2024, 11, 3, 4)
+    first_one_am = bucket_starts(utc(2024, 11, 3, 5, 30))
+    second_one_am = bucket_starts(utc(2024, 11, 3, 6, 30))
+    assert first_one_am[1:] == (utc(2024, 11, 3, 5), day)
+    assert second_one_am[1:] == (utc(2024, 11, 3, 6), day)
+    assert bucket_starts(utc(2024, 11, 4, 4, 59))[2] == day
+    assert bucket_starts(utc(2024, 11, 4, 5))[2] == utc(2024, 11, 4, 5)
+
+
+def test_rollups_count_outcomes_and_response_times(tmp_path, local_zone):
+    local_zone('UTC0')
+    hour = utc(2024, 5, 1, 9)
+    history = InterventionHistory(str(tmp_path / 'zombie_history.db'))
+    for offset, outcome, response_time in ((0, 'triggered', None), (10, 'success', 4.9), (59.5, 'success', 5.0),
+                                           (60, 'triggered', None), (70, 'success', 35.0), (3600, 'timeout', None)):
+        history.record(outcome, response_time=response_time, timestamp=hour + offset)
+    history.close()
+    try:
+        minutes = history.rollups('minute', hour, hour + 3600)
+        assert [row['bucket'] for row in minutes] == [hour, hour + 60]
+        assert (minutes[0]['triggered'], minutes[0]['success'], minutes[0]['response_time_sum']) == (1, 2, 9.9)
+        assert (minutes[0]['rt_lt5'], minutes[0]['rt_lt10']) == (1, 1)
+        assert (minutes[1]['success'], minutes[1]['rt_ge35']) == (1, 1)
+
+        hours = history.rollups('hour', hour)
+        assert [(row['bucket'], row['triggered'], row['success'], row['timeout']) for row in hours] == [
+            (hour, 2, 3, 0), (hour + 3600, 0, 0, 1)]
+        days = history.rollups('day', 0)
+        assert [(row['bucket'], row['success'], row['timeout']) for row in days] == [(utc(2024, 5, 1), 3, 1)]
+        with pytest.raises(ValueError):
+            history.rollups('week', 0)
+    finally:
+        history.close()
+
+
+def test_rollup_increments_match_raw_rows(local_zone):
+    local_zone('EST5EDT,M3.2.0,M11.1.0')
+    rows = [(utc(2024, 3, 10, 5) + i * 997.0, ('success', 'false_positive')[i % 2], None, None, float(i % 40), None)
+            for i in range(100)]
+    increments = rollup_increments(rows)
+    for granularity, position in (('minute', 0), ('hour', 1), ('day', 2)):
+        expected = {}
+        for row in rows:
+            bucket = bucket_starts(row[0])[position]
+            expected[bucket] = expected.get(bucket, 0) + 1
+        totals = {bucket: sum(counts[1:5]) for (name, bucket), counts in increments.items() if name == granularity}
+        assert totals == expected
+
+
+def freeze_local_time(monkeypatch, timestamp):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(timestamp, tz)
+    monkeypatch.setattr(app, 'datetime', FrozenDatetime)
+
+
+def test_roll_over_day_follows_the_local_date(local_zone, monkeypatch):
+    local_zone('EST5EDT,M3.2.0,M11.1.0')
+    gui = SimpleNamespace(stats={'today_date': '2024-03-10', 'today_interventions': 4})
+
+    # 23:59 EDT on the short spring-forward day is still the 10th although it is the 11th in UTC
+    freeze_local_time(monkeypatch, utc(2024, 3, 11, 3, 59))
+    app.ZombieCheck.roll_over_day(gui)
+    assert gui.stats == {'today_date': '2024-03-10', 'today_interventions': 4}
+
+    freeze_local_time(monkeypatch, utc(2024, 3, 11, 4))
+    app.ZombieCheck.roll_over_day(gui)
+    assert gui.stats == {'today_date': '2024-03-11', 'today_interventions': 0}
+    gui.stats['today_interventions'] = 2
+    app.ZombieCheck.roll_over_day(gui)
+    assert gui.stats['today_interventions'] == 2
+
+
+def test_load_stats_resets_a_stale_day(tmp_path, local_zone, monkeypatch):
+    local_zone('EST5EDT,M3.2.0,M11.1.0')
+    snapshot = str(tmp_path / 'zombie_stats.json')
+    with open(snapshot, 'w') as f:
+        json.dump({'stats': {'today_date': '2024-11-03', 'today_interventions': 6, 'total_interventions': 9},
+                   'seq': 1}, f)
+
+    # 23:30 EST on the 25-hour fall-back day
+    freeze_local_time(monkeypatch, utc(2024, 11, 4, 4, 30))
+    assert load_into_app(StatsJournal(snapshot)).stats['today_interventions'] == 6
+    freeze_local_time(monkeypatch, utc(2024, 11, 4, 5, 30))
+    gui = load_into_app(StatsJournal(snapshot))
+    assert (gui.stats['today_date'], gui.stats['today_interventions']) == ('2024-11-04', 0)
+    assert gui.stats['total_interventions'] == 9
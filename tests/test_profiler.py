@@ -0,0 +1,67 @@
+import re
+import threading
+import time
+from collections import Counter
+
+from profiler import SamplingProfiler
+
+COLLAPSED_LINE = re.compile(r"^[^;]+(;[^; ]+:[^; ]+)+ \d+$")
+
+
+def parked(event):
+    event.wait()
+
+
+def test_collapsed_stacks_name_thread_then_frames_outermost_first(tmp_path):
+    path = str(tmp_path / 'profile.folded')
+    profiler = SamplingProfiler(path)
+    event = threading.Event()
+    worker = threading.Thread(target=parked, args=(event,), name='worker')
+    worker.start()
+    try:
+        time.sleep(0.05)
+        profiler.started = time.perf_counter()
+        profiler.sample()
+        profiler.sample()
+    finally:
+        event.set()
+        worker.join()
+    profiler.stop()
+
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert lines and all(COLLAPSED_LINE.match(line) for line in lines)
+    assert not any(line.startswith('MainThread;') for line in lines)   # The sampling thread skips itself
+    stack, count = next(line for line in lines if line.startswith('worker;')).rsplit(' ', 1)
+    frames = stack.split(';')
+    assert count == '2'
+    assert frames[1] == 'threading.py:_bootstrap'
+    assert 'test_profiler.py:parked' in frames
+    assert frames.index('test_profiler.py:parked') < frames.index('threading.py:wait')
+    with open(path + '.summary.txt') as f:
+        assert f.readline().startswith("2 samples every 5ms over ")
+
+
+def test_summary_shares_self_and_inclusive_samples(tmp_path):
+    profiler = SamplingProfiler(str(tmp_path / 'profile.folded'), interval=0.005)
+    profiler.stacks = Counter({
+        'MainThread;app.py:mainloop;detector.py:evaluate': 3,
+        'MainThread;app.py:mainloop': 1,
+        'worker;audio.py:run;detector.py:evaluate': 2,
+        'worker;replay.py:walk;replay.py:walk': 2,    # Recursion counts once inclusively
+    })
+    profiler.samples = 4
+    profiler.sampling_time = 0.08
+
+    lines = profiler.summary(2.0)
+    assert lines[:3] == [
+        "4 samples every 5ms over 2.0s; sampler overhead 4.00% of one core",
+        "",
+        "   self    incl  function",
+    ]
+    assert lines[3] == " 62.50%  62.50%  detector.py:evaluate"
+    assert sorted(lines[4:]) == sorted([
+        " 12.50%  50.00%  app.py:mainloop",
+        "  0.00%  25.00%  audio.py:run",
+        " 25.00%  25.00%  replay.py:walk",
+    ])
@@ -0,0 +1,49 @@
+from simulate import DEFAULT_SETTINGS, DEFAULT_STATS
+from detector import ZombieDetector
+from stats_view import StatsPanel, PERFORMANCE_LINES, LIFETIME_LINES, stats_values
+
+
+def panel_values(stats=None, now=100.0):
+    stats = dict(DEFAULT_STATS, **(stats or {}))
+    detector = ZombieDetector(dict(DEFAULT_SETTINGS), stats)
+    return stats_values(stats, DEFAULT_SETTINGS, detector, now, True)
+
+
+def test_first_update_patches_every_line():
+    panel = StatsPanel(LIFETIME_LINES)
+    patches = panel.update(panel_values())
+    assert [index for index, _ in patches] == list(range(len(LIFETIME_LINES)))
+    assert panel.text().splitlines()[0] == "🏆 LIFETIME STATISTICS"
+
+
+def test_unchanged_values_emit_no_patches():
+    panel = StatsPanel(LIFETIME_LINES)
+    panel.update(panel_values())
+    assert panel.update(panel_values()) == []
+
+
+def test_only_lines_using_a_changed_field_are_patched():
+    panel = StatsPanel(PERFORMANCE_LINES)
+    panel.update(panel_values())
+    patches = panel.update(panel_values({'false_positives': 4}))
+    assert patches == [(3, "❌ False Positives: 4")]
+
+    # Two lines read current_streak: the streak line and the derived productivity score
+    patches = panel.update(panel_values({'false_positives': 4, 'current_streak': 2}))
+    assert [index for index, _ in patches] == [0, 5]
+    assert patches[1] == (5, "⚡ Current Streak: 2")
+
+
+def test_changed_input_with_same_text_is_not_patched():
+    panel = StatsPanel(["Current Tolerance: {tolerance_level:.0f}/100"])
+    assert panel.update({'tolerance_level': 50.2}) == [(0, "Current Tolerance: 50/100")]
+    assert panel.update({'tolerance_level': 49.9}) == []
+    assert panel.update({'tolerance_level': 51.0}) == [(0, "Current Tolerance: 51/100")]
+
+
+def test_text_matches_full_reformat_after_patches():
+    panel = StatsPanel(LIFETIME_LINES)
+    for stats in ({}, {'total_interventions': 3}, {'total_interventions': 3, 'longest_streak': 7}):
+        values = panel_values(stats)
+        panel.update(values)
+        assert panel.text() == "\n".join(template.format_map(values) for template in LIFETIME_LINES)
@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from timers import TimerService
+
+
+class ManualLoop(asyncio.SelectorEventLoop):
+    """Loop whose clock only moves when the test says so"""
+
+    now = 0.0
+
+    def time(self):
+        return self.now
+
+    def advance_to(self, now):
+        """Set the clock and run one iteration: everything due fires"""
+        self.now = now
+        self.call_soon(self.stop)
+        self.run_forever()
+
+
+@pytest.fixture
+def timers():
+    loop = ManualLoop()
+    service = TimerService(SimpleNamespace(loop=loop, poke=lambda: None, tasks=set()))
+    yield service
+    loop.close()
+
+
+def test_same_name_replaces_pending_timer(timers):
+    fired = []
+    timers.schedule('toasts.expiry', 1.0, fired.append, 'first')
+    timers.schedule('toasts.expiry', 2.0, fired.append, 'second')
+    timers.loop.advance_to(1.5)
+    assert fired == []
+    assert timers.pending('toasts.expiry')
+    timers.loop.advance_to(2.5)
+    assert fired == ['second']
+    assert not timers.pending('toasts.expiry')
+    timers.loop.advance_to(10.0)
+    assert fired == ['second']
+
+
+def test_cancel_prefix_only_cancels_matching_names(timers):
+    fired = []
+    for name in ('challenge.countdown', 'challenge.timeout', 'toasts.expiry'):
+        timers.schedule(name, 1.0, fired.append, name)
+    timers.cancel_prefix('challenge.')
+    assert [name for name in ('challenge.countdown', 'challenge.timeout', 'toasts.expiry')
+            if timers.pending(name)] == ['toasts.expiry']
+    timers.loop.advance_to(2.0)
+    assert fired == ['toasts.expiry']
+
+
+def test_interval_rearms_on_a_fixed_grid(timers):
+    fired = []
+    lags = []
+    timers.lag_observer = lambda name, lag: lags.append(round(lag, 9))
+    timers.schedule('metrics.export', 1.0, lambda: fired.append(timers.loop.time()), interval=1.0)
+
+    timers.loop.advance_to(1.3)     # Late tick: the next is still due at 2.0, not 2.3
+    assert timers.handles['metrics.export'][1] == 2.0
+    timers.loop.advance_to(2.0)
+    timers.loop.advance_to(5.5)     # Slots 3.0, 4.0 and 5.0 missed: one catch-up run, then 6.0
+    assert timers.handles['metrics.export'][1] == 6.0
+    timers.loop.advance_to(6.0)
+
+    assert fired == [1.3, 2.0, 5.5, 6.0]
+    assert lags == [0.3, 0.0, 2.5, 0.0]
+    assert timers.stats['metrics.export'].runs == 4
+
+
+def test_describe_counts_errors_and_keeps_periodic_timers(timers, capsys):
+    def broken():
+        raise RuntimeError("boom")
+
+    timers.schedule('broken', 1.0, broken, interval=1.0)
+    timers.schedule('once', 1.0, lambda: None)
+    timers.loop.advance_to(1.0)
+    timers.loop.advance_to(2.0)
+    assert "Error in timer broken: boom" in capsys.readouterr().out
+    assert timers.current is None
+
+    lines = {line.split()[0]: line for line in timers.describe()}
+    assert "in   1.000s every 1s" in lines['broken']
+    assert "runs=2" in lines['broken'] and lines['broken'].endswith("errors=2")
+    assert "idle" in lines['once']
+    assert "runs=1" in lines['once'] and lines['once'].endswith("errors=0")
@@ -0,0 +1,66 @@
+from toasts import ToastQueue, reading_time, MAX_VISIBLE, MIN_DURATION, MAX_DURATION
+
+
+def test_at_most_three_toasts_are_visible():
+    queue = ToastQueue()
+    toasts = [queue.push(f"Toast {i}", "message", now=0.0)[0] for i in range(5)]
+    assert queue.promote(0.0) == toasts[:MAX_VISIBLE]
+    assert queue.visible == toasts[:3]
+    assert list(queue.pending) == toasts[3:]
+    assert queue.promote(1.0) == []
+
+    # A freed slot goes to the oldest waiting toast, whose time starts when shown
+    queue.remove(toasts[1])
+    assert queue.promote(2.0) == [toasts[3]]
+    assert toasts[3].expires == 2.0 + toasts[3].duration
+    assert toasts[4].expires is None
+
+
+def test_repeats_coalesce_and_count():
+    queue = ToastQueue()
+    first, coalesced = queue.push("Stats Reset", "All statistics cleared", duration=5.0, now=0.0)
+    assert not coalesced
+    again, coalesced = queue.push("Stats Reset", "All statistics cleared", duration=9.0, now=0.5)
+    assert again is first and coalesced
+    assert first.count == 2
+    assert first.expires is None    # Still pending: its timer starts when shown
+    assert len(queue.pending) == 1
+
+    # Same title, different message: a separate toast
+    other, coalesced = queue.push("Stats Reset", "Nothing to clear", now=0.5)
+    assert other is not first and not coalesced
+
+
+def test_repeat_pushes_back_expiry_of_a_visible_toast():
+    queue = ToastQueue()
+    toast, _ = queue.push("Gaming Mode", "Enabled", duration=4.0, now=0.0)
+    queue.promote(0.0)
+    assert toast.expires == 4.0
+
+    queue.push("Gaming Mode", "Enabled", now=3.0)
+    assert toast.expires == 7.0
+    assert queue.expired(6.9) == []
+    assert queue.next_expiry() == 7.0
+    assert queue.expired(7.0) == [toast]
+
+    # A repeat never shortens the remaining time
+    queue.push("Gaming Mode", "Enabled", now=1.0)
+    assert toast.expires == 7.0
+    assert toast.count == 3
+
+
+def test_removed_toast_no_longer_coalesces():
+    queue = ToastQueue()
+    toast, _ = queue.push("Saved", "Settings saved", now=0.0)
+    queue.promote(0.0)
+    queue.remove(toast)
+    assert queue.next_expiry() is None
+    fresh, coalesced = queue.push("Saved", "Settings saved", now=1.0)
+    assert fresh is not toast and not coalesced
+    assert fresh.count == 1
+
+
+def test_reading_time_is_bounded():
+    assert reading_time("") == MIN_DURATION
+    assert MIN_DURATION < reading_time("x" * 50) < MAX_DURATION
+    assert reading_time("x" * 10000) == MAX_DURATION
@@ -0,0 +1,113 @@
+"""Named timers on the app's asyncio loop
+
+Every delayed callback in the GUI goes through one TimerService instead of
+ad-hoc root.after() calls, so none can be lost track of:
+
+    schedule(name, delay, callback)   one-shot; replaces a pending timer of
+                                      the same name (deduplication)
+    schedule(..., interval=s)         periodic, on a fixed grid (no drift)
+    cancel(name) / cancel_prefix(p)   e.g. 'challenge.' when the dialog hides
+    describe()                        pending timers with their next deadline,
+                                      plus run counts and callback time
+
+The timers themselves are loop TimerHandles, kept in asyncio's heap and
+woken through TkAsyncBridge, so nothing ticks while nothing is due.
+"""
+import time
+
+
+class TimerStats:
+    __slots__ = ('runs', 'total', 'worst', 'errors')
+
+    def __init__(self):
+        self.runs = 0
+        self.total = 0.0    # Seconds spent in the callback
+        self.worst = 0.0
+        self.errors = 0
+
+
+class TimerService:
+    """Named, deduplicated, cancellable timers with per-name cost accounting"""
+
+    def __init__(self, core):
+        self.core = core
+        self.loop = core.loop
+        self.handles = {}   # name -> (TimerHandle, due in loop time, interval)
+        self.stats = {}     # name -> TimerStats, kept after the timer is gone
+        self.current = None         # Name of the timer whose callback is running
+        self.lag_observer = None    # Called with (name, seconds late) as each timer fires
+        self.schedule_observer = None   # Called with no arguments after schedule()
+
+    def schedule(self, name, delay, callback, *args, interval=None):
+        """Run callback(*args) after delay seconds, replacing any pending timer called name"""
+        self.cancel(name)
+        due = self.loop.time() + max(0.0, delay)
+        handle = self.loop.call_at(due, self.fire, name, callback, args)
+        self.handles[name] = (handle, due, interval)
+        self.core.poke()
+        if self.schedule_observer is not None:
+            self.schedule_observer()
+
+    def pending(self, name):
+        return name in self.handles
+
+    def cancel(self, name):
+        entry = self.handles.pop(name, None)
+        if entry is not None:
+            entry[0].cancel()
+
+    def cancel_prefix(self, prefix):
+        for name in [name for name in self.handles if name.startswith(prefix)]:
+            self.cancel(name)
+
+    def cancel_all(self):
+        for name in list(self.handles):
+            self.cancel(name)
+
+    def fire(self, name, callback, args):
+        _, due, interval = self.handles.pop(name)
+        now = self.loop.time()
+        if self.lag_observer is not None:
+            self.lag_observer(name, now - due)
+        if interval is not None:
+            # Next slot on the grid, skipping any that were missed
+            due += interval * max(1, int((now - due) // interval) + 1)
+            handle = self.loop.call_at(due, self.fire, name, callback, args)
+            self.handles[name] = (handle, due, interval)
+
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = TimerStats()
+        self.current = name
+        start = time.perf_counter()
+        try:
+            callback(*args)
+        except Exception as e:
+            stats.errors += 1
+            print(f"Error in timer {name}: {e}")
+        finally:
+            self.current = None
+        elapsed = time.perf_counter() - start
+        stats.runs += 1
+        stats.total += elapsed
+        stats.worst = max(stats.worst, elapsed)
+
+    def describe(self):
+        """One line per timer or task: next deadline, runs and callback time"""
+        now = self.loop.time()
+        lines = []
+        for name in sorted(set(self.handles) | set(self.stats)):
+            entry = self.handles.get(name)
+            if entry is None:
+                when = "idle"
+            else:
+                when = f"in {entry[1] - now:7.3f}s"
+                if entry[2] is not None:
+                    when += f" every {entry[2]:g}s"
+            stats = self.stats.get(name) or TimerStats()
+            mean = stats.total / stats.runs if stats.runs else 0.0
+            lines.append(f"{name:<24} {when:<24} runs={stats.runs:<6} "
+                         f"mean={mean * 1e3:.3f}ms max={stats.worst * 1e3:.3f}ms errors={stats.errors}")
+        for task in sorted(self.core.tasks, key=lambda task: task.get_name()):
+            lines.append(f"task {task.get_name():<19} running")
+        return lines
@@ -0,0 +1,189 @@
+"""Non-modal notification toasts
+
+messagebox dialogs run a nested modal loop until clicked. Toasts are
+borderless topmost windows stacked in a corner of the main window that
+dismiss themselves (or on click), so the Tk event loop, and with it
+analysis ticks, countdowns and input tracking, keeps running.
+
+ToastQueue holds the pending/visible bookkeeping and is independent of
+Tk; ToastManager renders it. A toast with the same title and message as
+one already queued or visible is coalesced into it: its repeat count goes
+up and its dismissal is pushed back instead of stacking a duplicate.
+"""
+import tkinter as tk
+import tkinter.font as tkfont
+from collections import deque
+
+MAX_VISIBLE = 3
+MIN_DURATION = 3.0          # Seconds a toast stays up...
+SECONDS_PER_CHAR = 0.04     # ...plus reading time...
+MAX_DURATION = 12.0         # ...up to this
+
+STYLES = {
+    'info': "#1f6feb",
+    'success': "#238636",
+    'warning': "#fd7e14",
+    'error': "#da3633",
+}
+
+
+def reading_time(message):
+    return min(MAX_DURATION, MIN_DURATION + SECONDS_PER_CHAR * len(message))
+
+
+class Toast:
+    __slots__ = ('title', 'message', 'kind', 'duration', 'count', 'expires', 'widget', 'label')
+
+    def __init__(self, title, message, kind, duration):
+        self.title = title
+        self.message = message
+        self.kind = kind
+        self.duration = duration
+        self.count = 1
+        self.expires = None     # Set when shown
+        self.widget = None
+        self.label = None       # Title label, updated with the repeat count
+
+    @property
+    def key(self):
+        return (self.title, self.message)
+
+
+class ToastQueue:
+    """Pending and visible toasts, with coalescing of repeats"""
+
+    def __init__(self, max_visible=MAX_VISIBLE):
+        self.max_visible = max_visible
+        self.pending = deque()
+        self.visible = []
+        self.by_key = {}
+
+    def push(self, title, message, kind='info', duration=None, now=0.0):
+        """Queue a toast; returns (toast, coalesced)"""
+        toast = self.by_key.get((title, message))
+        if toast is not None:
+            toast.count += 1
+            if toast.expires is not None:
+                toast.expires = max(toast.expires, now + toast.duration)
+            return toast, True
+        toast = Toast(title, message, kind, duration if duration is not None else reading_time(message))
+        self.pending.append(toast)
+        self.by_key[toast.key] = toast
+        return toast, False
+
+    def promote(self, now):
+        """Move pending toasts into free visible slots; returns the newly visible ones"""
+        shown = []
+        while self.pending and len(self.visible) < self.max_visible:
+            toast = self.pending.popleft()
+            toast.expires = now + toast.duration
+            self.visible.append(toast)
+            shown.append(toast)
+        return shown
+
+    def expired(self, now):
+        return [toast for toast in self.visible if toast.expires <= now]
+
+    def remove(self, toast):
+        if toast in self.visible:
+            self.visible.remove(toast)
+        elif toast in self.pending:
+            self.pending.remove(toast)
+        self.by_key.pop(toast.key, None)
+
+    def next_expiry(self):
+        return min((toast.expires for toast in self.visible), default=None)
+
+
+class ToastManager:
+    """Shows ToastQueue entries as stacked borderless windows over the app"""
+
+    def __init__(self, root, clock, timers, width=340):
+        self.root = root
+        self.clock = clock
+        self.timers = timers    # timers.TimerService; expiry runs as 'toasts.expiry'
+        self.width = width
+        self.queue = ToastQueue()
+        self.title_font = tkfont.Font(family="Segoe UI", size=11, weight="bold")
+        self.body_font = tkfont.Font(family="Segoe UI", size=10)
+
+    def show(self, title, message, kind='info', duration=None):
+        """Queue a toast and return immediately"""
+        now = self.clock.now()
+        toast, coalesced = self.queue.push(title, message, kind, duration, now)
+        if coalesced:
+            if toast.label is not None:
+                toast.label.config(text=f"{toast.title}  ×{toast.count}")
+        else:
+            self.refresh()
+
+    def dismiss(self, toast):
+        self.queue.remove(toast)
+        if toast.widget is not None:
+            toast.widget.destroy()
+            toast.widget = None
+        self.refresh()
+
+    def clear(self):
+        for toast in list(self.queue.visible) + list(self.queue.pending):
+            self.queue.remove(toast)
+            if toast.widget is not None:
+                toast.widget.destroy()
+                toast.widget = None
+        self.timers.cancel('toasts.expiry')
+
+    def refresh(self):
+        """Drop expired toasts, show waiting ones, restack, and arm the next expiry"""
+        self.timers.cancel('toasts.expiry')
+        now = self.clock.now()
+        for toast in self.queue.expired(now):
+            self.queue.remove(toast)
+            if toast.widget is not None:
+                toast.widget.destroy()
+                toast.widget = None
+        for toast in self.queue.promote(now):
+            toast.widget = self.build(toast)
+        self.restack()
+
+        expiry = self.queue.next_expiry()
+        if expiry is not None:
+            self.timers.schedule('toasts.expiry', expiry - now + 0.001, self.refresh)
+
+    def build(self, toast):
+        color = STYLES.get(toast.kind, STYLES['info'])
+        window = tk.Toplevel(self.root)
+        window.withdraw()
+        window.overrideredirect(True)
+        window.attributes('-topmost', True)
+        window.configure(bg=color)
+
+        title = toast.title if toast.count == 1 else f"{toast.title}  ×{toast.count}"
+        toast.label = tk.Label(window, text=title, font=self.title_font,
+                               fg="white", bg=color, anchor="w", justify="left")
+        toast.label.pack(fill="x", padx=12, pady=(8, 2))
+        body = tk.Label(window, text=toast.message, font=self.body_font, fg="white", bg=color,
+                        anchor="w", justify="left", wraplength=self.width - 24)
+        body.pack(fill="x", padx=12, pady=(0, 10))
+
+        for widget in (window, toast.label, body):
+            widget.bind('<Button-1>', lambda event, toast=toast: self.dismiss(toast))
+        return window
+
+    def restack(self):
+        """Stack visible toasts upwards from the bottom-right corner of the main window"""
+        if not self.queue.visible:
+            return
+        if self.root.winfo_width() > 1:
+            right = self.root.winfo_rootx() + self.root.winfo_width() - 12
+            bottom = self.root.winfo_rooty() + self.root.winfo_height() - 12
+        else:  # Main window not mapped yet
+            right = self.root.winfo_screenwidth() - 24
+            bottom = self.root.winfo_screenheight() - 72
+        for toast in self.queue.visible:
+            window = toast.widget
+            window.update_idletasks()
+            height = window.winfo_reqheight()
+            bottom -= height
+            window.geometry(f"{self.width}x{height}+{right - self.width}+{bottom}")
+            bottom -= 8
+            window.deiconify()